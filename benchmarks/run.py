@@ -0,0 +1,248 @@
+"""
+Times each stage of the pipeline over the models in resources/ and writes
+the results to a JSON file, so runs before and after a change can be
+compared:
+
+    python benchmarks/run.py --output results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+from PyQt5.QtCore import QT_VERSION_STR  # noqa: E402
+from PyQt5.QtGui import QImage, QPainter  # noqa: E402
+
+from surrender import drawing, offscreen, raster  # noqa: E402
+from surrender.io.obj_io import OBJIO  # noqa: E402
+from surrender.scene import Scene  # noqa: E402
+from surrender.shapes import (  # noqa: E402
+    Bezier,
+    BSpline,
+    BicubicBezier,
+    BicubicBspline,
+)
+from surrender.vector import Vector  # noqa: E402
+from surrender.view import View  # noqa: E402
+
+MODELS = ("bowler", "dinomech", "cristo", "teapot", "bunny", "subzero")
+SIZE = (800, 600)
+
+# fraction of the model seen by each camera, the close one exercises the
+# clipping of shapes crossing the border of the view
+CAMERAS = {"full": 1, "close": 0.25}
+
+
+def measure(function, repeat, setup=None):
+    """
+    Returns the wall time in seconds of `repeat` calls of `function`,
+    running `setup` untimed before each one.
+    """
+
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def summary(stage, case, times, **extra):
+    return {
+        "stage": stage,
+        "case": case,
+        "best": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "runs": times,
+        **extra,
+    }
+
+
+def framing_window(scene, fraction):
+    """
+    A window in front of the whole scene, seeing `fraction` of its height
+    around its center. The distance of projection grows with the scene so
+    deep models keep their size on screen.
+    """
+
+    bounds = [shape.aabb() for shape in scene.shapes if shape.aabb() is not None]
+    lower = np.min([lower for lower, _ in bounds], axis=0)
+    upper = np.max([upper for _, upper in bounds], axis=0)
+    center = (lower + upper) / 2
+    radius = np.linalg.norm(upper - lower) / 2
+
+    width, height = SIZE
+    h = radius * fraction
+    w = h * width / height
+    x, y, z = center[0], center[1], center[2] - radius - 1
+    return View(
+        Vector(x - w, y + h, z),
+        Vector(x + w, y + h, z),
+        Vector(x + w, y - h, z),
+        Vector(x - w, y - h, z),
+        projection_distance=4 * radius,
+    )
+
+
+def screen_target():
+    width, height = SIZE
+    return View(
+        Vector(0, height),
+        Vector(width, height),
+        Vector(width, 0),
+        Vector(0, 0),
+    )
+
+
+def bench_read(path, repeat):
+    return measure(lambda: list(OBJIO.read(path)), repeat)
+
+
+def bench_projection(scene, window, repeat):
+    """
+    Times projected_shapes with the frame cache emptied before each run,
+    so every shape goes through projection, viewport mapping and clipping.
+    """
+
+    target = screen_target()
+
+    def clear():
+        scene.cache = {}
+
+    # the first frame builds meshlets and levels of detail once
+    scene.projected_shapes(window, target)
+    return measure(lambda: scene.projected_shapes(window, target), repeat, clear)
+
+
+def bench_draw(shapes, repeat):
+    width, height = SIZE
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    pixels = np.zeros((height, width, 3), dtype=np.uint8)
+
+    def qpainter():
+        painter = QPainter(image)
+        drawing.draw_shapes(shapes, painter)
+        painter.end()
+
+    return {
+        "qpainter": measure(qpainter, repeat, lambda: image.fill(0)),
+        "raster": measure(
+            lambda: raster.rasterize_shapes(pixels, shapes),
+            repeat,
+            lambda: pixels.fill(0),
+        ),
+    }
+
+
+def control_points(count, rng):
+    points = rng.uniform(-500, 500, (count, 3))
+    return [Vector(*p) for p in points]
+
+
+def control_grid(size, rng):
+    return [control_points(size, rng) for _ in range(size)]
+
+
+def bench_tessellation(repeat):
+    rng = np.random.default_rng(0)
+    results = []
+
+    # 100 cubic pieces each, tessellated at the resolutions of a zoomed in
+    # and a zoomed out view
+    for cls in (Bezier, BSpline):
+        curve = cls("curve", control_points(301, rng))
+        for resolution in (5, 50):
+            times = measure(lambda: curve.set_resolution(resolution), repeat)
+            case = f"{cls.__name__}/{resolution}"
+            results.append(summary("tessellation", case, times))
+
+    for cls, size in ((BicubicBezier, 4), (BicubicBspline, 7)):
+        grid = control_grid(size, rng)
+        times = measure(lambda: cls("surface", grid), repeat)
+        results.append(summary("tessellation", f"{cls.__name__}/{size}x{size}", times))
+
+    return results
+
+
+def run(models, repeat):
+    offscreen.ensure_application()
+    results = []
+
+    for name in models:
+        path = ROOT / "resources" / f"{name}.obj"
+        print(f"{name}: read", flush=True)
+        results.append(summary("read", name, bench_read(path, repeat)))
+
+        scene = Scene()
+        for shape in OBJIO.read(path):
+            scene.add_shape(shape)
+        extra = {
+            "vertices": scene.pool.size,
+            "edges": int(sum(len(getattr(s, "edges", ())) for s in scene.shapes)),
+        }
+
+        for camera, fraction in CAMERAS.items():
+            case = f"{name}/{camera}"
+            window = framing_window(scene, fraction)
+
+            print(f"{case}: projection", flush=True)
+            times = bench_projection(scene, window, repeat)
+            results.append(summary("projection", case, times, **extra))
+
+            print(f"{case}: draw", flush=True)
+            shapes = scene.projected_shapes(window, screen_target())
+            for backend, times in bench_draw(shapes, repeat).items():
+                results.append(summary(f"draw/{backend}", case, times, **extra))
+
+    print("tessellation", flush=True)
+    results.extend(bench_tessellation(repeat))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the pipeline stages.")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--models", nargs="+", default=MODELS, choices=MODELS)
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "qt": QT_VERSION_STR,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+            "size": SIZE,
+        },
+        "results": run(args.models, args.repeat),
+    }
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    for result in report["results"]:
+        stage = result["stage"]
+        case = result["case"]
+        print(f"{stage:16} {case:28} {result['best'] * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import numpy as np
+
 from surrender.vector import Vector
 from surrender.utils import adjacents
 
@@ -110,6 +112,99 @@ def cohen_sutherland(p0, p1, window):
         return None
 
 
+def point_codes(points, window):
+    x = points[:, 0]
+    y = points[:, 1]
+
+    codes = np.zeros(len(points), dtype=np.int8)
+    codes[y > window.max().y] |= UP
+    codes[y < window.min().y] |= BOTTOM
+    codes[x > window.max().x] |= RIGHT
+    codes[x < window.min().x] |= LEFT
+    return codes
+
+
+def cohen_sutherland_segments(starts, ends, window):
+    """
+    Cohen-Sutherland for arrays of segments. Outcodes are computed for
+    every segment at once, segments are trivially accepted or rejected in
+    bulk and intersections are only computed for the ones that straddle
+    the window. Returns the starts and ends of the visible segments.
+    """
+
+    xmin, ymin = window.min().x, window.min().y
+    xmax, ymax = window.max().x, window.max().y
+
+    starts = np.array(starts, dtype=float)
+    ends = np.array(ends, dtype=float)
+    start_codes = point_codes(starts, window)
+    end_codes = point_codes(ends, window)
+
+    keep = (start_codes & end_codes) == 0
+    active = np.flatnonzero(keep & ((start_codes | end_codes) != 0))
+
+    # every pass moves one endpoint of each segment to a window edge,
+    # which happens at most twice per endpoint
+    for _ in range(4):
+        if len(active) == 0:
+            break
+
+        p0 = starts[active]
+        p1 = ends[active]
+        c0 = start_codes[active]
+        c1 = end_codes[active]
+
+        move_start = c0 != 0
+        code = np.where(move_start, c0, c1)
+
+        dx = p1[:, 0] - p0[:, 0]
+        dy = p1[:, 1] - p0[:, 1]
+
+        conditions = [
+            (code & UP) != 0,
+            (code & BOTTOM) != 0,
+            (code & RIGHT) != 0,
+            (code & LEFT) != 0,
+        ]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = np.select(
+                conditions,
+                [
+                    p0[:, 0] + dx * (ymax - p0[:, 1]) / dy,
+                    p0[:, 0] + dx * (ymin - p0[:, 1]) / dy,
+                    np.full(len(code), xmax),
+                    np.full(len(code), xmin),
+                ],
+            )
+            y = np.select(
+                conditions,
+                [
+                    np.full(len(code), ymax),
+                    np.full(len(code), ymin),
+                    p0[:, 1] + dy * (xmax - p0[:, 0]) / dx,
+                    p0[:, 1] + dy * (xmin - p0[:, 0]) / dx,
+                ],
+            )
+
+        moved = np.column_stack((x, y))
+
+        i = active[move_start]
+        starts[i, :2] = moved[move_start]
+        start_codes[i] = point_codes(starts[i], window)
+
+        i = active[~move_start]
+        ends[i, :2] = moved[~move_start]
+        end_codes[i] = point_codes(ends[i], window)
+
+        c0 = start_codes[active]
+        c1 = end_codes[active]
+        keep[active] = (c0 & c1) == 0
+        active = active[keep[active] & ((c0 | c1) != 0)]
+
+    return starts[keep], ends[keep]
+
+
 def liang_barsky(p0, p1, window):
     delta = p1 - p0
 
@@ -160,6 +255,39 @@ def liang_barsky(p0, p1, window):
     return points
 
 
+def liang_barsky_segments(starts, ends, window):
+    """
+    Liang-Barsky for arrays of segments. Returns the parameters u0 and u1
+    of every segment together with the clipped starts and ends; segments
+    outside the window have u0 > u1.
+    """
+
+    delta = ends - starts
+
+    p = np.stack((-delta[:, 0], delta[:, 0], -delta[:, 1], delta[:, 1]))
+    q = np.stack(
+        (
+            starts[:, 0] - window.min().x,
+            window.max().x - starts[:, 0],
+            starts[:, 1] - window.min().y,
+            window.max().y - starts[:, 1],
+        )
+    )
+
+    r = np.divide(q, p, out=np.zeros_like(q), where=p != 0)
+
+    u0 = np.max(np.where(p < 0, r, 0), axis=0, initial=0)
+    u1 = np.min(np.where(p > 0, r, 1), axis=0, initial=1)
+
+    parallel_outside = np.any((p == 0) & (q < 0), axis=0)
+    u0[parallel_outside] = 1
+    u1[parallel_outside] = 0
+
+    clipped_starts = starts + u0[:, None] * delta
+    clipped_ends = starts + u1[:, None] * delta
+    return u0, u1, clipped_starts, clipped_ends
+
+
 def cut_min_x(points, minx, closed):
     points_with_intersection = []
 
@@ -315,3 +443,112 @@ def sutherland_hodgeman(points, window, closed=True):
     clipped = cut_min_y(clipped, window.min().y, closed)
     clipped = cut_max_y(clipped, window.max().y, closed)
     return clipped
+
+
+# DEPTH ALGORITHMS
+def _depth_parameters(starts, ends, near, far):
+    z0 = starts[:, 2]
+    dz = ends[:, 2] - z0
+    moving = dz != 0
+
+    t_near = np.divide(near - z0, dz, out=np.zeros_like(dz), where=moving)
+    t_far = np.divide(far - z0, dz, out=np.zeros_like(dz), where=moving)
+
+    u0 = np.zeros_like(dz)
+    u1 = np.ones_like(dz)
+
+    forward = dz > 0
+    backward = dz < 0
+
+    u0 = np.where(forward, np.maximum(u0, t_near), u0)
+    u1 = np.where(backward, np.minimum(u1, t_near), u1)
+    u1 = np.where(forward, np.minimum(u1, t_far), u1)
+    u0 = np.where(backward, np.maximum(u0, t_far), u0)
+
+    parallel_outside = ~moving & ((z0 < near) | (z0 > far))
+    keep = (u0 <= u1) & ~parallel_outside
+    return u0, u1, keep
+
+
+def clip_segments_depth(starts, ends, near, far):
+    """
+    Liang-Barsky against the near and far planes of camera space for
+    arrays of segments. Returns the trimmed starts and ends of the segments
+    that are at least partially between both planes.
+    """
+
+    u0, u1, keep = _depth_parameters(starts, ends, near, far)
+
+    delta = ends[keep] - starts[keep]
+    new_starts = starts[keep] + u0[keep, None] * delta
+    new_ends = starts[keep] + u1[keep, None] * delta
+    return new_starts, new_ends
+
+
+def clip_polyline_depth(points, near, far):
+    """
+    Clips an open (N, 3) path against the near and far planes of camera
+    space. The path is cut wherever it leaves the depth range, so a list
+    of (K, 3) runs is returned, each to be drawn on its own.
+    """
+
+    if len(points) < 2:
+        return []
+
+    starts, ends = points[:-1], points[1:]
+    u0, u1, keep = _depth_parameters(starts, ends, near, far)
+    indexes = np.flatnonzero(keep)
+    if len(indexes) == 0:
+        return []
+
+    delta = ends[indexes] - starts[indexes]
+    new_starts = starts[indexes] + u0[indexes, None] * delta
+    new_ends = starts[indexes] + u1[indexes, None] * delta
+
+    # a segment continues the previous run only if both are kept and
+    # neither was trimmed at the vertex they share
+    previous = indexes[:-1]
+    following = indexes[1:]
+    joined = (following == previous + 1) & (u1[previous] == 1) & (u0[following] == 0)
+    breaks = np.flatnonzero(~joined) + 1
+
+    runs = []
+    for s, e in zip(np.split(new_starts, breaks), np.split(new_ends, breaks)):
+        runs.append(np.concatenate((s[:1], e)))
+    return runs
+
+
+def _cut_depth(points, plane, side):
+    if len(points) == 0:
+        return points
+
+    distance = (points[:, 2] - plane) * side
+    following = np.roll(points, -1, axis=0)
+    following_distance = np.roll(distance, -1)
+
+    inside = distance >= 0
+    crossing = inside != (following_distance >= 0)
+
+    t = np.divide(
+        distance,
+        distance - following_distance,
+        out=np.zeros_like(distance),
+        where=crossing,
+    )
+    intersections = points + t[:, None] * (following - points)
+
+    candidates = np.stack((points, intersections), axis=1)
+    mask = np.column_stack((inside, crossing))
+    return candidates[mask]
+
+
+def clip_polygon_depth(points, near, far):
+    """
+    Sutherland-Hodgeman against the near and far planes of camera space
+    for a (N, 3) array of the vertices of a closed polygon. Open paths go
+    through clip_polyline_depth instead.
+    """
+
+    clipped = _cut_depth(points, near, 1)
+    clipped = _cut_depth(clipped, far, -1)
+    return clipped
@@ -3,3 +3,6 @@ WINDOW_HEIGHT = 1200
 WINDOW_WIDTH = 600
 PIX_PER_MOVEMENT = 25
 ZOOM_FACTOR = 1.2
+PAN_SETTLE_TIME = 150
+REFINE_DELAY = 50
+REFINE_DETAILS = (0.25, 1)
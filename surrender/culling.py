@@ -0,0 +1,134 @@
+import numpy as np
+
+from surrender.projection import camera_matrix, camera_to_viewport
+
+# the 8 corners of a box as (x, y, z) flags telling if the max bound is used
+BOX_CORNERS = np.array([[i >> 2 & 1, i >> 1 & 1, i & 1] for i in range(8)], dtype=bool)
+
+# the 12 edges of a box as pairs of corners differing in a single flag
+BOX_EDGES = np.array(
+    [(i, i | bit) for i in range(8) for bit in (1, 2, 4) if not i & bit]
+)
+
+
+def box_corners(lower, upper):
+    lower = np.asarray(lower, dtype=float).reshape(-1, 1, 3)
+    upper = np.asarray(upper, dtype=float).reshape(-1, 1, 3)
+    return np.where(BOX_CORNERS, upper, lower)
+
+
+def transform_bounds(lower, upper, centers, radii, matrix):
+    """
+    Takes arrays of boxes and spheres through an affine `matrix`. The new
+    boxes enclose the transformed corners and the radii grow by the
+    largest scale factor of the matrix.
+    """
+
+    corners = box_corners(lower, upper)
+    corners = corners @ matrix[:3, :3] + matrix[3, :3]
+    centers = centers @ matrix[:3, :3] + matrix[3, :3]
+    radii = radii * np.linalg.norm(matrix[:3, :3], 2)
+    return corners.min(axis=1), corners.max(axis=1), centers, radii
+
+
+def classify_bounds(
+    lower, upper, centers, radii, window, target, clip=None, unclipped=None
+):
+    """
+    Tests arrays of world space boxes and spheres against the view volume
+    of `window` and the `target` viewport, or only the `clip` region of
+    the viewport when given. Bounds flagged in the `unclipped` mask are
+    drawn past the viewport, so only their depth is tested.
+
+    Returns three boolean arrays: `visible` for bounds that may show up
+    on screen, `inside` for bounds that lie entirely inside the viewport
+    and need no clipping, and `in_depth` for bounds that lie entirely
+    between the near and far planes and need no depth clipping.
+    """
+
+    matrix = camera_matrix(window)
+    near = window.near
+    far = window.far
+
+    # the camera matrix is rigid, so spheres keep their radius
+    z = centers @ matrix[:3, 2] + matrix[3, 2]
+    sphere_visible = (z + radii >= near) & (z - radii <= far)
+    sphere_in_depth = (z - radii >= near) & (z + radii <= far)
+
+    corners = box_corners(lower, upper).reshape(-1, 3)
+    corners = corners @ matrix[:3, :3] + matrix[3, :3]
+    corners_in_front = (corners[:, 2] >= near).reshape(-1, 8).all(axis=1)
+
+    # a box in front of the camera projects inside the 2D bounds of its
+    # projected corners
+    with np.errstate(divide="ignore", invalid="ignore"):
+        screen = camera_to_viewport(corners, window, target).reshape(-1, 8, 3)
+    screen_min = screen[:, :, :2].min(axis=1)
+    screen_max = screen[:, :, :2].max(axis=1)
+
+    clip = target if clip is None else clip
+    clip_min = np.array([clip.min().x, clip.min().y])
+    clip_max = np.array([clip.max().x, clip.max().y])
+
+    overlaps = np.all((screen_max >= clip_min) & (screen_min <= clip_max), axis=1)
+    contained = np.all((screen_min >= clip_min) & (screen_max <= clip_max), axis=1)
+
+    if unclipped is not None:
+        overlaps |= unclipped
+
+    visible = sphere_visible & (overlaps | ~corners_in_front)
+    inside = visible & corners_in_front & contained
+    return visible, inside, sphere_in_depth
+
+
+def screen_radii(centers, radii, window, target):
+    """
+    Returns the radius in pixels of world space spheres projected on the
+    `target` viewport, infinite for spheres crossing the near plane.
+    """
+
+    matrix = camera_matrix(window)
+    z = centers @ matrix[:3, 2] + matrix[3, 2]
+
+    scale = window.projection_distance * target.width() / window.width()
+    with np.errstate(divide="ignore"):
+        pixels = radii * scale / z
+    pixels[z - radii <= window.near] = np.inf
+    return pixels
+
+
+def not_clipped(shape):
+    """
+    Tells if `shape` is drawn as it is, past the border of the viewport.
+    """
+    algorithm = getattr(shape, "DO_NOT_CLIP", None)
+    return algorithm is not None and shape.CLIPPING_ALGORITHM == algorithm
+
+
+def classify_shapes(shapes, window, target, clip=None):
+    """
+    Runs classify_bounds over the cached world bounds of every shape,
+    before anything is projected. Shapes without geometry are never
+    visible, and shapes drawn without clipping are only culled by depth.
+    """
+
+    n = len(shapes)
+    visible = np.zeros(n, dtype=bool)
+    inside = np.zeros(n, dtype=bool)
+    in_depth = np.zeros(n, dtype=bool)
+
+    bounded = [i for i, shape in enumerate(shapes) if shape.aabb() is not None]
+    if not bounded:
+        return visible, inside, in_depth
+
+    lower = np.array([shapes[i].aabb()[0] for i in bounded])
+    upper = np.array([shapes[i].aabb()[1] for i in bounded])
+    centers = np.array([shapes[i].bounding_sphere()[0] for i in bounded])
+    radii = np.array([shapes[i].bounding_sphere()[1] for i in bounded])
+    unclipped = np.array([not_clipped(shapes[i]) for i in bounded])
+
+    result = classify_bounds(
+        lower, upper, centers, radii, window, target, clip, unclipped
+    )
+    visible[bounded], inside[bounded], in_depth[bounded] = result
+    return visible, inside, in_depth
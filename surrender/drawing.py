@@ -0,0 +1,115 @@
+import numpy as np
+from PyQt5 import QtGui, QtCore
+from PyQt5.QtGui import QBrush, QPen, QColor
+from PyQt5.QtCore import Qt
+from surrender.shapes import (
+    Point,
+    Line,
+    Polygon,
+    Object3D,
+    BSpline,
+    BicubicBezier,
+    Bezier,
+)
+
+
+def draw_point(point, painter):
+    painter.drawPoint(int(point.pos.x), int(point.pos.y))
+
+
+def draw_line(line, painter):
+    painter.drawLine(
+        int(line.start.x), int(line.start.y), int(line.end.x), int(line.end.y)
+    )
+
+
+def draw_lines(starts, ends, painter):
+    """
+    Draws every segment from the (N, 2+) arrays `starts` and `ends` with a
+    single QPainter call. The coordinates are truncated the same way
+    draw_line does it.
+    """
+
+    n = len(starts)
+    if n == 0:
+        return
+
+    # the point pairs are written straight into the QPolygon storage
+    pairs = QtGui.QPolygon(2 * n)
+    pointer = pairs.data()
+    pointer.setsize(2 * n * 2 * 4)
+    buffer = np.frombuffer(pointer, dtype=np.int32).reshape(n, 2, 2)
+    buffer[:, 0] = starts[:, :2]
+    buffer[:, 1] = ends[:, :2]
+
+    painter.drawLines(pairs)
+
+
+def draw_polygon(polygon, painter):
+    if polygon.style == Polygon.FILLED:
+        poly = QtGui.QPolygonF()
+        for p in polygon.points():
+            poly.append(QtCore.QPointF(p.x, p.y))
+        painter.drawPolygon(poly)
+    else:
+        points = np.array([p.data for p in polygon.points()]).reshape(-1, 3)
+        if polygon.style == Polygon.OPEN:
+            draw_lines(points[:-1], points[1:], painter)
+        else:
+            draw_lines(points, np.roll(points, -1, axis=0), painter)
+
+
+def draw_curve(curve, painter):
+    poly = curve.as_polygon()
+    poly.CLIPPING_ALGORITHM = curve.CLIPPING_ALGORITHM
+    draw_polygon(poly, painter)
+
+
+def draw_3d(shape, painter):
+    vertices = shape.vertices.data
+    edges = shape.edges
+    draw_lines(vertices[edges[:, 0]], vertices[edges[:, 1]], painter)
+
+
+def draw_shape(shape, painter):
+    if isinstance(shape, Point):
+        draw_point(shape, painter)
+
+    elif isinstance(shape, Line):
+        draw_line(shape, painter)
+
+    elif isinstance(shape, Polygon):
+        draw_polygon(shape, painter)
+
+    elif isinstance(shape, Bezier | BSpline):
+        draw_curve(shape, painter)
+
+    elif isinstance(shape, Object3D):
+        draw_3d(shape, painter)
+
+    elif isinstance(shape, BicubicBezier):
+        draw_3d(shape.as_object_3d(), painter)
+
+    else:
+        raise ValueError(f"The object {shape} is not supported.")
+
+
+def draw_shapes(shapes, painter):
+    """
+    Draws screen space `shapes` in their own colors, with the pen and
+    brush of the viewport.
+    """
+
+    pen = QPen()
+    pen.setWidth(2)
+    pen.setCapStyle(Qt.RoundCap)
+
+    brush = QBrush()
+    brush.setStyle(1)
+
+    for shape in shapes:
+        pen.setColor(QColor(*shape.color))
+        brush.setColor(QColor(*shape.color))
+        painter.setPen(pen)
+        painter.setBrush(brush)
+        draw_shape(shape, painter)
@@ -1,5 +1,7 @@
+import numpy as np
+
 from surrender.shapes import Object3D
-from surrender.utils import adjacents
+from surrender.utils import adjacents, unique_edges
 
 
 class OBJ3DDescriptor:
@@ -8,12 +10,11 @@ class OBJ3DDescriptor:
         vertices = ""
         lines = ""
 
-        i = index
-        for a, b in shape.segments:
-            vertices += f"v {a.x} {a.y} {a.z} \n"
-            vertices += f"v {b.x} {b.y} {b.z} \n"
-            lines += f"l {i} {i+1}"
-            i += 2
+        for p in shape.positions():
+            vertices += f"v {p[0]} {p[1]} {p[2]} \n"
+
+        for a, b in shape.edges:
+            lines += f"l {a + index} {b + index} \n"
 
         string = vertices
         string += f"o {shape.name} \n"
@@ -22,14 +23,15 @@ class OBJ3DDescriptor:
 
     @classmethod
     def parse_string(cls, name, tokens, vertices):
-        segments = []
+        edges = []
+        face_sizes = []
+        from_face = []
         factor = 100
         for token in tokens:
             if token.type == "l":
                 points = [int(i) for i in token.args.split()]
-                for a, b in adjacents(points):
-                    segment = (vertices[a - 1] * factor, vertices[b - 1] * factor)
-                    segments.append(segment)
+                edges.extend(adjacents(points))
+                from_face.extend([False] * (len(points) - 1))
 
             if token.type == "f":
                 points = []
@@ -37,8 +39,23 @@ class OBJ3DDescriptor:
                     splited = vargs.split("/")
                     points.append(int(splited[0]))
 
-                for a, b in adjacents(points, circular=True):
-                    segment = (vertices[a - 1] * factor, vertices[b - 1] * factor)
-                    segments.append(segment)
+                edges.extend(adjacents(points, circular=True))
+                from_face.extend([True] * len(points))
+                face_sizes.append(len(points))
+
+        edges = np.array(edges, dtype=np.int32).reshape(-1, 2)
+        used, local_edges = np.unique(edges, return_inverse=True)
+
+        # edges shared by neighbouring faces are only kept once
+        local_edges, edge_of = unique_edges(local_edges, len(used))
+
+        faces = None
+        if face_sizes:
+            offsets = np.concatenate(([0], np.cumsum(face_sizes)))
+            faces = (offsets, edge_of[np.array(from_face)])
+
+        local_vertices = vertices.data[used - 1] * factor
 
-        return Object3D(name, segments, color=(0, 100, 200))
+        return Object3D.from_arrays(
+            name, local_vertices, local_edges, color=(0, 100, 200), faces=faces
+        )
@@ -8,7 +8,7 @@ from surrender.io.obj import (
 )
 
 from surrender.shapes import Point, Line, Polygon
-from surrender.vector import Vector
+from surrender.vector import VectorArray
 
 line_regex = re.compile(r"[fgplov]((\s*)|(\s[\d|\s|\w|.]*))")
 
@@ -29,6 +29,8 @@ class OBJParser:
             if descriptor is None:
                 print(f"Warning: Falha ao encontrar o descritor de {shape}")
                 continue
+            shape = shape.copy()
+            shape.bake_transform()
             string += descriptor.encode_shape(shape, index)
             num_points = len(shape.points())
             index += num_points
@@ -103,10 +105,9 @@ class OBJParser:
 
     @classmethod
     def _read_vertices(cls, tokens):
-        vertices = []
+        coords = []
         for token in tokens:
             if token.type == "v":
                 x, y, z = (float(i) for i in token.args.split())
-                v = Vector(x, y, z)
-                vertices.append(v)
-        return vertices
+                coords.append((x, y, z))
+        return VectorArray(coords)
@@ -10,6 +10,8 @@ class OBJWriter:
 
         index = 1
         for i, shape in enumerate(self.shapes):
+            shape = shape.copy()
+            shape.bake_transform()
             descriptor = OBJDescriptor(shape)
 
             string += f"g Object{i} \n"
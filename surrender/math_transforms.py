@@ -50,3 +50,12 @@ def rotation_matrix(delta):
     rz = rotation_matrix_z(delta.z)
     matrix = rx @ ry @ rz
     return matrix
+
+
+def around_matrix(matrix, around=None):
+    if around is None:
+        return matrix
+
+    t0 = translation_matrix(-around)
+    t1 = translation_matrix(around)
+    return t0 @ matrix @ t1
@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import QVBoxLayout, QPushButton, QTreeView, QWidget
 
 from PyQt5.QtGui import QStandardItemModel, QStandardItem, QBrush, QColor
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QModelIndex, pyqtSignal
 
 
 class CustomTable(QTreeView):
@@ -32,6 +32,7 @@ class ObjectList(QWidget):
 
         self.viewport = viewport
         self.viewport.shapeModified.connect(self.update)
+        self.viewport.shapeSelected.connect(self.select_callback)
 
         self.table = CustomTable()
         self.table.setHorizontalHeaderLabels(["NAME", "SHAPE", "COLOR"])
@@ -55,6 +56,15 @@ class ObjectList(QWidget):
         i = self.table.currentIndex().row()
         self.viewport.selected_shape = self.viewport.get_shape_by_index(i)
 
+    def select_callback(self):
+        shapes = self.viewport.scene.shapes
+        selected = self.viewport.selected_shape
+        for i, shape in enumerate(shapes):
+            if shape is selected:
+                self.table.setCurrentIndex(self.table.model.index(i, 0))
+                return
+        self.table.setCurrentIndex(QModelIndex())
+
     def delete_callback(self):
         selected = self.viewport.selected_shape
         self.viewport.remove_shape(selected)
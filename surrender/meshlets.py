@@ -0,0 +1,82 @@
+import numpy as np
+
+from surrender.culling import transform_bounds
+
+MESHLET_SIZE = 256
+
+
+def _spread_bits(values):
+    # inserts two zero bits between each of the lower 10 bits
+    v = values.astype(np.uint64)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x030000FF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x0300F00F)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x030C30C3)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x09249249)
+    return v
+
+
+def morton_order(points, bits=10):
+    """
+    Returns the indexes sorting `points` along a Z-order curve over their
+    bounding box, so points close in the result are close in space.
+    """
+
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    if len(points) == 0:
+        return np.zeros(0, dtype=np.intp)
+
+    lower = points.min(axis=0)
+    extent = points.max(axis=0) - lower
+    extent[extent == 0] = 1
+
+    cells = (1 << bits) - 1
+    grid = ((points - lower) / extent * cells).astype(np.int64)
+    codes = _spread_bits(grid[:, 0])
+    codes |= _spread_bits(grid[:, 1]) << np.uint64(1)
+    codes |= _spread_bits(grid[:, 2]) << np.uint64(2)
+    return np.argsort(codes, kind="stable")
+
+
+class Meshlets:
+    """
+    Splits the edges of an indexed mesh into runs of `size` edges close in
+    space, each with its own bounds, so the parts of a large mesh that are
+    off screen can be culled without touching their vertices. The edges
+    are sorted along morton_order here, the mesh itself is left as it is.
+    """
+
+    def __init__(self, vertices, edges, size=MESHLET_SIZE):
+        starts = vertices[edges[:, 0]]
+        ends = vertices[edges[:, 1]]
+        self.order = morton_order(starts + ends)
+        starts = starts[self.order]
+        ends = ends[self.order]
+
+        self.offsets = np.arange(0, len(edges), size)
+        self.counts = np.diff(np.append(self.offsets, len(edges)))
+        self.lower = np.minimum.reduceat(np.minimum(starts, ends), self.offsets)
+        self.upper = np.maximum.reduceat(np.maximum(starts, ends), self.offsets)
+
+        self.centers = (self.lower + self.upper) / 2
+        self.radii = np.linalg.norm(self.upper - self.lower, axis=1) / 2
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def world_bounds(self, matrix):
+        """
+        Returns the bounds of every meshlet taken to world space by the
+        model `matrix` of its shape, ready for classify_bounds.
+        """
+        return transform_bounds(
+            self.lower, self.upper, self.centers, self.radii, matrix
+        )
+
+    def edge_mask(self, visible):
+        """
+        Returns the mask of the edges of the mesh, in their own order, in
+        the `visible` meshlets.
+        """
+        mask = np.empty(len(self.order), dtype=bool)
+        mask[self.order] = np.repeat(visible, self.counts)
+        return mask
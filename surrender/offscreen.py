@@ -0,0 +1,64 @@
+import os
+
+from PyQt5.QtGui import QGuiApplication, QImage, QPainter, QPalette
+
+from surrender import drawing
+from surrender.view import View
+from surrender.vector import Vector
+
+# kept alive for the painters, when no application was created before
+_application = None
+
+
+def ensure_application():
+    """
+    Creates a QGuiApplication on the offscreen platform, unless the
+    process already runs one, so nothing needs a display.
+    """
+    global _application
+
+    application = QGuiApplication.instance()
+    if application is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        application = _application = QGuiApplication([])
+    return application
+
+
+def render(scene, window, size, background=None):
+    """
+    Draws `scene` seen through the `window` camera into a new QImage of
+    `size` (width, height) pixels, going through the same projection,
+    clipping and drawing as the Viewport.
+    """
+
+    ensure_application()
+
+    width, height = size
+    target = View(
+        Vector(0, height),
+        Vector(width, height),
+        Vector(width, 0),
+        Vector(0, 0),
+    )
+
+    if background is None:
+        background = QGuiApplication.palette().color(QPalette.Window)
+
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    image.fill(background)
+
+    painter = QPainter(image)
+    drawing.draw_shapes(scene.projected_shapes(window, target), painter)
+    painter.end()
+    return image
+
+
+def render_to_file(scene, window, size, path, background=None):
+    """
+    Renders like render and saves the image to `path`, as a PNG unless the
+    extension names another format.
+    """
+    image = render(scene, window, size, background)
+    if not image.save(path):
+        raise IOError(f"Could not save the image to {path}")
+    return image
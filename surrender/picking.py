@@ -0,0 +1,164 @@
+import numpy as np
+
+from surrender.shapes import Point, Line, Polygon, Object3D, Bezier, BSpline
+
+
+def _polyline(points, closed):
+    points = np.array([p.data[:2] for p in points], dtype=float).reshape(-1, 2)
+    if closed:
+        return points, np.roll(points, -1, axis=0)
+    return points[:-1], points[1:]
+
+
+def screen_segments(shape):
+    """
+    Returns the (K, 2) arrays of segment starts and ends drawn for a
+    projected shape. Points are segments of length zero.
+    """
+
+    if isinstance(shape, Point):
+        p = shape.pos.data[None, :2]
+        return p, p
+
+    if isinstance(shape, Line):
+        return shape.start.data[None, :2], shape.end.data[None, :2]
+
+    if isinstance(shape, Polygon):
+        return _polyline(shape.points(), shape.style != Polygon.OPEN)
+
+    if isinstance(shape, Bezier | BSpline):
+        # the polyline drawn, clipped, without tessellating the curve again
+        return screen_segments(shape.as_polygon())
+
+    if isinstance(shape, Object3D):
+        vertices = shape.vertices.data[:, :2]
+        return vertices[shape.edges[:, 0]], vertices[shape.edges[:, 1]]
+
+    raise ValueError(f"The object {shape} is not supported.")
+
+
+class PickingIndex:
+    """
+    Uniform grid over the screen space segments of the last frame, used
+    to find the shape under the cursor without projecting the scene
+    again. Each shape is binned on its own and only binned again when its
+    segments change, the merged grid is rebuilt lazily before a query.
+    """
+
+    def __init__(self, cell_size=32):
+        self.cell_size = cell_size
+        self.entries = {}
+        self._grid = None
+
+    def update(self, frame):
+        """
+        Takes the (shape, projected) pairs of a frame, where `shape` is the
+        scene shape and `projected` is the screen space copy drawn for it.
+        """
+
+        segments = {}
+        for shape, projected in frame:
+            starts, ends = screen_segments(projected)
+            if shape in segments:
+                starts = np.concatenate((segments[shape][0], starts))
+                ends = np.concatenate((segments[shape][1], ends))
+            segments[shape] = (starts, ends)
+
+        for shape in list(self.entries):
+            if shape not in segments:
+                del self.entries[shape]
+                self._grid = None
+
+        for shape, (starts, ends) in segments.items():
+            entry = self.entries.get(shape)
+            if entry is not None and _same_segments(entry, starts, ends):
+                continue
+            self.entries[shape] = self._bin(starts, ends)
+            self._grid = None
+
+    def _bin(self, starts, ends):
+        starts = np.array(starts, dtype=float)
+        ends = np.array(ends, dtype=float)
+
+        # every cell overlapped by the bounding box of a segment
+        lower = np.floor(np.minimum(starts, ends) / self.cell_size).astype(np.int64)
+        upper = np.floor(np.maximum(starts, ends) / self.cell_size).astype(np.int64)
+        spans = upper - lower + 1
+        counts = spans[:, 0] * spans[:, 1]
+
+        segment = np.repeat(np.arange(len(starts)), counts)
+        k = np.arange(len(segment)) - np.repeat(np.cumsum(counts) - counts, counts)
+        cx = lower[segment, 0] + k % spans[segment, 0]
+        cy = lower[segment, 1] + k // spans[segment, 0]
+
+        return starts, ends, _cell_keys(cx, cy), segment
+
+    def _merged(self):
+        if self._grid is None:
+            shapes = list(self.entries)
+            entries = [self.entries[shape] for shape in shapes]
+
+            sizes = [len(e[0]) for e in entries]
+            offsets = np.cumsum([0] + sizes)[:-1]
+
+            starts = np.concatenate([e[0] for e in entries] or [np.zeros((0, 2))])
+            ends = np.concatenate([e[1] for e in entries] or [np.zeros((0, 2))])
+            owners = np.repeat(np.arange(len(shapes)), sizes)
+
+            keys = [e[2] for e in entries]
+            segments = [e[3] + o for e, o in zip(entries, offsets)]
+            keys = np.concatenate(keys or [np.zeros(0, dtype=np.int64)])
+            segments = np.concatenate(segments or [np.zeros(0, dtype=np.int64)])
+
+            order = np.argsort(keys, kind="stable")
+            self._grid = (shapes, starts, ends, owners, keys[order], segments[order])
+
+        return self._grid
+
+    def nearest(self, x, y, tolerance=5):
+        """
+        Returns the shape with the segment closest to the screen point
+        (x, y), or None if nothing was drawn within `tolerance` pixels.
+        """
+
+        shapes, starts, ends, owners, keys, segments = self._merged()
+        if len(keys) == 0:
+            return None
+
+        lower = np.floor((np.array([x, y]) - tolerance) / self.cell_size)
+        upper = np.floor((np.array([x, y]) + tolerance) / self.cell_size)
+        cx, cy = np.meshgrid(
+            np.arange(lower[0], upper[0] + 1, dtype=np.int64),
+            np.arange(lower[1], upper[1] + 1, dtype=np.int64),
+        )
+        cells = _cell_keys(cx.ravel(), cy.ravel())
+
+        first = np.searchsorted(keys, cells, side="left")
+        last = np.searchsorted(keys, cells, side="right")
+        candidates = np.concatenate([segments[a:b] for a, b in zip(first, last)])
+        if len(candidates) == 0:
+            return None
+
+        distances = _distances(np.array([x, y]), starts[candidates], ends[candidates])
+        best = np.argmin(distances)
+        if distances[best] > tolerance:
+            return None
+        return shapes[owners[candidates[best]]]
+
+
+def _cell_keys(cx, cy):
+    # packs both cell coordinates into a single sortable integer
+    return (cx << 32) + (cy & 0xFFFFFFFF)
+
+
+def _same_segments(entry, starts, ends):
+    return np.array_equal(entry[0], starts) and np.array_equal(entry[1], ends)
+
+
+def _distances(point, starts, ends):
+    delta = ends - starts
+    length = np.einsum("ij,ij->i", delta, delta)
+    length[length == 0] = 1
+    t = np.einsum("ij,ij->i", point - starts, delta) / length
+    closest = starts + np.clip(t, 0, 1)[:, None] * delta
+    return np.linalg.norm(closest - point, axis=1)
@@ -48,7 +48,8 @@ def parallel_projection(shapes, window):
     for shape in shapes:
         shape = deepcopy(shape)
         shape.move(-wc)
-        shape.apply_transform(alignment_matrix)
+        shape.transform(alignment_matrix)
+        shape.bake_transform()
         yield shape
 
 
@@ -61,7 +62,8 @@ def perspective_projection(shapes, window):
     for shape in shapes:
         shape = deepcopy(shape)
         shape.move(-cop)
-        shape.apply_transform(alignment_matrix)
+        shape.transform(alignment_matrix)
+        shape.bake_transform()
 
         for p in shape.points():
             x = (d * p.x) / p.z
@@ -76,47 +78,87 @@ def perspective_projection(shapes, window):
     return projected_shapes
 
 
-def faster_transform_viewport(shapes, source, target):
-    source_delta = source.max() - source.min()
-    target_delta = target.max() - target.min()
-
-    x_factor = target_delta.x / source_delta.x
-    y_factor = target_delta.y / source_delta.y
-
-    for shape in shapes:
-        for vector in shape.points():
-            vector.x = (vector.x - source.min().x) * x_factor
-            vector.y = (source.max().y - vector.y) * y_factor
-
-
-def faster_perspective_projection(shapes, window):
+def camera_matrix(window):
     cop = window.center_of_projection()
     uv = window.up_vector()
     nv = window.normal_vector()
-    d = window.projection_distance
 
     translation = translation_matrix(-cop)
     rotation = _alignment_matrix(uv, nv)
-    perspective_matrix = translation @ rotation
-
-    vectors = []
-    for shape in shapes:
-        for point in shape.points():
-            vectors.append(point)
-
-    if len(vectors) == 0:
-        return
+    return translation @ rotation
+
+
+def to_camera(pool, window, out=None, shapes=None, rows=None):
+    """
+    Takes every vertex of a VertexPool to camera space with a single
+    matrix product, fusing the model matrix of each transformed shape
+    into the camera matrix of its slice. When `shapes` is given only
+    their slices are transformed, one at a time, and `rows` may map some
+    of them to the pool indexes of the only vertices needed.
+
+    Together with camera_to_viewport, everything is done with whole-array
+    expressions, aiming at well over 10 million vertices per second on a
+    single core.
+    """
+
+    perspective_matrix = camera_matrix(window)
+    identity = np.identity(4)
+
+    positions = pool.positions()
+    if out is None:
+        out = np.empty_like(positions)
+    else:
+        out = out[: len(positions)]
+
+    if shapes is not None:
+        rows = rows or {}
+        for shape in shapes:
+            matrix = shape.model_matrix @ perspective_matrix
+            if shape in rows:
+                r = rows[shape]
+                out[r] = positions[r] @ matrix[:3, :3] + matrix[3, :3]
+                continue
+            s = pool.slice_of(shape)
+            np.matmul(positions[s], matrix[:3, :3], out=out[s])
+            out[s] += matrix[3, :3]
+        return out
+
+    matrix = perspective_matrix
+    np.matmul(positions, matrix[:3, :3], out=out)
+    out += matrix[3, :3]
+
+    for shape, s in pool.slices.items():
+        if np.array_equal(shape.model_matrix, identity):
+            continue
+        matrix = shape.model_matrix @ perspective_matrix
+        np.matmul(positions[s], matrix[:3, :3], out=out[s])
+        out[s] += matrix[3, :3]
+
+    return out
+
+
+def camera_to_viewport(positions, window, target):
+    """
+    Applies the perspective divide and the window to viewport mapping to
+    camera space `positions` in place.
+    """
 
-    size = (len(vectors), 4)
-    positions = np.zeros(size)
+    d = window.projection_distance
 
-    for pos, vec in zip(positions, vectors):
-        pos[:] = vec.x, vec.y, vec.z, 1
+    source = window.ppc()
+    source_min = source.min()
+    source_max = source.max()
+    source_delta = source_max - source_min
+    target_delta = target.max() - target.min()
 
-    result = positions @ perspective_matrix
+    x_factor = target_delta.x / source_delta.x
+    y_factor = target_delta.y / source_delta.y
 
-    for pos, vec in zip(result, vectors):
-        x, y, z = pos[:3]
-        vec.x = x * d / z
-        vec.y = y * d / z
-        vec.z = 0
+    # x' = (x * d / z - min.x) * x_factor and y' = (max.y - y * d / z) * y_factor
+    factor = d / positions[:, 2]
+    positions[:, 0] *= factor * x_factor
+    positions[:, 0] -= source_min.x * x_factor
+    positions[:, 1] *= factor * -y_factor
+    positions[:, 1] += source_max.y * y_factor
+    positions[:, 2] = 0
+    return positions
@@ -0,0 +1,211 @@
+import numpy as np
+from PyQt5 import sip
+from PyQt5.QtGui import QImage
+
+from surrender.clipping import liang_barsky_segments
+from surrender.view import View
+from surrender.vector import Vector
+from surrender.shapes import (
+    Point,
+    Line,
+    Polygon,
+    Object3D,
+    BSpline,
+    Bezier,
+)
+
+
+def image_array(image):
+    """
+    Returns an (H, W, 3) uint8 view of the pixels of a Format_RGB888
+    QImage, sharing its memory.
+    """
+
+    if image.format() != QImage.Format_RGB888:
+        raise ValueError(f"The format {image.format()} is not supported.")
+
+    pointer = image.bits()
+    pointer.setsize(image.sizeInBytes())
+    rows = np.frombuffer(pointer, dtype=np.uint8).reshape(image.height(), -1)
+    return rows[:, : 3 * image.width()].reshape(image.height(), image.width(), 3)
+
+
+def array_image(buffer):
+    """
+    Wraps a C-contiguous (H, W, 3) uint8 array in a Format_RGB888 QImage
+    reading and writing straight to its memory. The array must outlive
+    the image.
+    """
+
+    height, width, _ = buffer.shape
+    data = sip.voidptr(buffer.ctypes.data)
+    return QImage(data, width, height, 3 * width, QImage.Format_RGB888)
+
+
+def _bounds_of(buffer, rect):
+    height, width, _ = buffer.shape
+    if rect is None:
+        return 0, 0, width, height
+
+    x0, y0, x1, y1 = rect
+    return max(0, x0), max(0, y0), min(width, x1), min(height, y1)
+
+
+def rasterize_segments(buffer, starts, ends, colors, width=2, rect=None):
+    """
+    Draws the segments from the (N, 2+) arrays `starts` and `ends` into
+    `buffer`, each in its row of the (N, 3) `colors`. Every pixel of every
+    segment is computed at once with a DDA over the concatenated steps of
+    all segments. Pixels outside the (x0, y0, x1, y1) `rect` are left
+    untouched.
+    """
+
+    x0, y0, x1, y1 = _bounds_of(buffer, rect)
+    if len(starts) == 0 or x0 >= x1 or y0 >= y1:
+        return
+
+    # segments are cut to the bounds first, so their length in pixels
+    # stays within the size of the buffer
+    window = View(Vector(x0, y1), Vector(x1, y1), Vector(x1, y0), Vector(x0, y0))
+    starts = np.array(starts, dtype=float)[:, :2]
+    ends = np.array(ends, dtype=float)[:, :2]
+    u0, u1, starts, ends = liang_barsky_segments(starts, ends, window)
+    keep = u0 <= u1
+    starts, ends = starts[keep], ends[keep]
+    colors = np.asarray(colors, dtype=np.uint8)[keep]
+    if len(starts) == 0:
+        return
+
+    # coordinates are truncated the same way draw_line does it
+    a = np.trunc(starts).astype(np.int64)
+    b = np.trunc(ends).astype(np.int64)
+    delta = b - a
+    steps = np.abs(delta).max(axis=1)
+    counts = steps + 1
+
+    segment = np.repeat(np.arange(len(a)), counts)
+    t = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    t = t / np.maximum(steps, 1)[segment]
+
+    xs = np.rint(a[segment, 0] + delta[segment, 0] * t).astype(np.int64)
+    ys = np.rint(a[segment, 1] + delta[segment, 1] * t).astype(np.int64)
+
+    # thick lines are stamped across their minor axis
+    steep = (np.abs(delta[:, 1]) > np.abs(delta[:, 0]))[segment]
+    for offset in range(-(width // 2), width - width // 2):
+        px = np.where(steep, xs + offset, xs)
+        py = np.where(steep, ys, ys + offset)
+        inside = (px >= x0) & (px < x1) & (py >= y0) & (py < y1)
+        buffer[py[inside], px[inside]] = colors[segment[inside]]
+
+
+def rasterize_points(buffer, points, colors, width=2, rect=None):
+    """
+    Draws a `width` wide square for each of the (N, 2+) `points`.
+    """
+
+    x0, y0, x1, y1 = _bounds_of(buffer, rect)
+    if len(points) == 0:
+        return
+
+    points = np.trunc(np.asarray(points, dtype=float)[:, :2]).astype(np.int64)
+    colors = np.asarray(colors, dtype=np.uint8)
+    offsets = np.arange(-(width // 2), width - width // 2)
+    for ox in offsets:
+        for oy in offsets:
+            px = points[:, 0] + ox
+            py = points[:, 1] + oy
+            inside = (px >= x0) & (px < x1) & (py >= y0) & (py < y1)
+            buffer[py[inside], px[inside]] = colors[inside]
+
+
+def fill_polygon(buffer, points, color, rect=None):
+    """
+    Fills the polygon with (K, 2+) `points` following the even-odd rule,
+    testing the centers of every pixel of its bounding box at once.
+    """
+
+    x0, y0, x1, y1 = _bounds_of(buffer, rect)
+    points = np.asarray(points, dtype=float)[:, :2]
+    if len(points) < 3:
+        return
+
+    lower = np.maximum(np.floor(points.min(axis=0)).astype(int), (x0, y0))
+    upper = np.minimum(np.ceil(points.max(axis=0)).astype(int), (x1, y1))
+    if np.any(lower >= upper):
+        return
+
+    x = np.arange(lower[0], upper[0]) + 0.5
+    y = np.arange(lower[1], upper[1])[:, None] + 0.5
+
+    inside = np.zeros((len(y), len(x)), dtype=bool)
+    for (ax, ay), (bx, by) in zip(points, np.roll(points, -1, axis=0)):
+        if ay == by:
+            continue
+        crosses = (ay > y) != (by > y)
+        at = ax + (y - ay) * (bx - ax) / (by - ay)
+        inside ^= crosses & (x < at)
+
+    region = buffer[lower[1] : upper[1], lower[0] : upper[0]]
+    region[inside] = color
+
+
+def _polyline(points, closed):
+    points = np.array([p.data for p in points], dtype=float).reshape(-1, 3)
+    if closed:
+        return points, np.roll(points, -1, axis=0)
+    return points[:-1], points[1:]
+
+
+def rasterize_shapes(buffer, shapes, width=2, rect=None):
+    """
+    Draws screen space `shapes` into `buffer`. The segments of all shapes
+    are gathered and rasterized together, after the filled polygons.
+    """
+
+    starts, ends, segment_colors = [], [], []
+    points, point_colors = [], []
+
+    def add(s, e, color):
+        starts.append(s)
+        ends.append(e)
+        segment_colors.append(np.broadcast_to(color, (len(s), 3)))
+
+    for shape in shapes:
+        color = np.array(shape.color, dtype=np.uint8)
+
+        if isinstance(shape, Bezier | BSpline):
+            shape = shape.as_polygon()
+
+        if isinstance(shape, Point):
+            points.append(shape.pos.data)
+            point_colors.append(color)
+
+        elif isinstance(shape, Line):
+            add(shape.start.data[None], shape.end.data[None], color)
+
+        elif isinstance(shape, Polygon):
+            closed = shape.style != Polygon.OPEN
+            s, e = _polyline(shape.points(), closed)
+            if shape.style == Polygon.FILLED:
+                fill_polygon(buffer, s, color, rect)
+            add(s, e, color)
+
+        elif isinstance(shape, Object3D):
+            vertices = shape.vertices.data
+            add(vertices[shape.edges[:, 0]], vertices[shape.edges[:, 1]], color)
+
+        else:
+            raise ValueError(f"The object {shape} is not supported.")
+
+    if starts:
+        rasterize_segments(
+            buffer,
+            np.concatenate(starts),
+            np.concatenate(ends),
+            np.concatenate(segment_colors),
+            width,
+            rect,
+        )
+    if points:
+        rasterize_points(buffer, np.array(points), np.array(point_colors), width, rect)
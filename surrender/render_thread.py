@@ -0,0 +1,68 @@
+import threading
+from dataclasses import dataclass
+
+from PyQt5.QtCore import QObject, QThread, QCoreApplication, pyqtSignal
+
+
+@dataclass(frozen=True)
+class FrameResult:
+    """
+    The screen space shapes of one frame, together with the version of
+    the window they were projected through.
+    """
+
+    window_version: int
+    shapes: tuple
+
+
+class RenderWorker(QObject):
+    """
+    Runs Scene.projected_shapes on its own thread. Requests are kept in a
+    single slot, so camera states submitted while a frame is in flight
+    replace each other and only the latest one is projected.
+    """
+
+    finished = pyqtSignal(object)
+    wake = pyqtSignal()
+
+    def __init__(self, scene):
+        super().__init__()
+        self.scene = scene
+        self.request = None
+        self.lock = threading.Lock()
+
+        self.thread = QThread()
+        self.moveToThread(self.thread)
+        self.wake.connect(self.run)
+        self.thread.start()
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def submit(self, window, target, detail=1):
+        """
+        Asks for a frame seen through copies of `window` and `target`,
+        dropping any request not started yet.
+        """
+        request = (window.copy(), target.copy(), detail)
+        with self.lock:
+            idle = self.request is None
+            self.request = request
+        if idle:
+            self.wake.emit()
+
+    def run(self):
+        with self.lock:
+            request = self.request
+            self.request = None
+        if request is None:
+            return
+
+        window, target, detail = request
+        shapes = self.scene.projected_shapes(window, target, detail=detail)
+        self.finished.emit(FrameResult(window.version, tuple(shapes)))
+
+    def stop(self):
+        self.thread.quit()
+        self.thread.wait()
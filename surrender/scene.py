@@ -1,29 +1,418 @@
-from surrender.projection import (
-    faster_perspective_projection,
-    faster_transform_viewport,
+import threading
+
+import numpy as np
+
+from surrender.vertex_pool import VertexPool
+from surrender.shapes import Point, Line, Polygon
+from surrender.shapes.generic_curve import GenericCurve
+from surrender.clipping import liang_barsky_segments, cohen_sutherland_segments
+from surrender.projection import to_camera, camera_to_viewport, camera_matrix
+from surrender.culling import (
+    BOX_EDGES,
+    box_corners,
+    classify_shapes,
+    classify_bounds,
+    screen_radii,
 )
+from surrender.picking import PickingIndex
 
 
 class Scene:
     def __init__(self):
         self.shapes = []
+        self.pool = VertexPool()
+        self.buffers = {}
         self.gliphs = []
         self.window = None
+        self.frame = []
+        self.picking = PickingIndex()
+        self.picked_frame = None
+        self.cache = {}
+        self.cache_key = None
+        self.edits = 0
+
+        # held while the shapes and the pool are changed or copied. Frames
+        # are projected from a copy, outside of it, as they may be drawn
+        # on a render thread
+        self.lock = threading.RLock()
+
+    @property
+    def version(self):
+        """
+        Changes whenever a shape is added, removed or changed.
+        """
+        with self.lock:
+            return self.edits, max((s.version for s in self.shapes), default=None)
+
+    def projected_shapes(self, origin, target, clip=None, detail=1):
+        """
+        Returns the screen space copies of the shapes seen through the
+        `origin` window and mapped to the `target` viewport. Passing a
+        `clip` region of the viewport redraws only the shapes over it,
+        clipped to it, and a `detail` below 1 draws meshes from coarser
+        levels of detail.
+
+        Full frames are cached per shape, so only the shapes changed since
+        the last frame are projected again while the camera stands still.
+        """
+
+        if clip is not None or detail != 1:
+            with self.lock:
+                shapes = list(self.shapes)
+                pool = self._snapshot()
+
+            region = target if clip is None else clip
+            frame = self._clipped_frame(shapes, pool, origin, target, region, detail)
+            return [self._detached(shape) for _, shape in frame]
 
-    def projected_shapes(self, origin, target):
-        shapes = [shape.copy() for shape in self.shapes]
+        key = self._frame_key(origin, target)
+        with self.lock:
+            if key != self.cache_key:
+                self.cache = {}
+                self.cache_key = key
 
-        faster_perspective_projection(shapes, origin)
-        faster_transform_viewport(shapes, origin.ppc(), target)
+            shapes = list(self.shapes)
+            cache = {}
+            stale = []
+            for shape in shapes:
+                cached = self.cache.get(shape)
+                if cached is None or cached[0] != shape.version:
+                    stale.append(shape)
+                else:
+                    cache[shape] = cached
 
-        clipped_shapes = []
+            # versions are read with the pool, so shapes changed while
+            # projecting are projected again on the next frame
+            versions = [shape.version for shape in stale]
+            pool = self._snapshot() if stale else None
+
+        if stale:
+            results = {}
+            for original, shape in self._clipped_frame(
+                stale, pool, origin, target, target
+            ):
+                results[original] = self._detached(shape)
+
+            for shape, version in zip(stale, versions):
+                cache[shape] = (version, results.get(shape))
+
+        frame = []
         for shape in shapes:
-            clipped = shape.clipped(target)
+            _, projected = cache[shape]
+            if projected is not None:
+                frame.append((shape, projected))
+
+        with self.lock:
+            # a frame of an older camera, or of removed shapes, is not kept
+            if key == self.cache_key:
+                for shape in stale:
+                    if shape in self.pool.slices:
+                        self.cache[shape] = cache[shape]
+
+            # kept so the shapes on screen can be picked without projecting
+            self.frame = [(o, p) for o, p in frame if o in self.pool.slices]
+
+        return [shape for _, shape in frame]
+
+    def _snapshot(self):
+        return self.pool.snapshot(self._buffer("pool", len(self.pool.data)))
+
+    def _buffer(self, role, rows):
+        """
+        Returns an (N, 3) array of at least `rows` rows used by the calling
+        thread alone.
+        """
+
+        key = (threading.get_ident(), role)
+        array = self.buffers.get(key)
+        if array is None or len(array) < rows:
+            array = self.buffers[key] = np.zeros((rows, 3))
+        return array
+
+    def _detached(self, shape):
+        # the copies may still be views into the screen buffer, which the
+        # next frame overwrites
+        return shape.rebound(np.array(shape.positions()))
+
+    def _frame_key(self, origin, target):
+        algorithms = tuple(
+            cls.CLIPPING_ALGORITHM for cls in (Point, Line, Polygon, GenericCurve)
+        )
+        return (
+            origin.version,
+            origin.projection_distance,
+            origin.near,
+            origin.far,
+            tuple(target.min().data),
+            tuple(target.max().data),
+            algorithms,
+        )
+
+    def _clipped_frame(self, shapes, pool, origin, target, clip, detail=1):
+        """
+        Projects and clips `shapes`, read from the `pool` snapshot,
+        returning (shape, copy) pairs in the order the shapes are drawn.
+        """
+
+        batch_lines = Line.CLIPPING_ALGORITHM == Line.LIANG_BARSKY
+
+        lines = []
+        slots = []
+        frame = []
+        projected = self._projected(shapes, pool, origin, target, clip, detail)
+        for original, shape, inside in projected:
+            if inside:
+                frame.append((original, shape.unclipped(clip)))
+                continue
+
+            if batch_lines and isinstance(shape, Line):
+                # a slot is kept for the line, filled once the batch is clipped
+                lines.append((original, shape))
+                slots.append(len(frame))
+                frame.append(None)
+                continue
+
+            clipped = shape.clipped(clip)
             if clipped is not None:
-                clipped_shapes.append(clipped)
-        shapes = clipped_shapes
+                frame.append((original, clipped))
+
+        for slot, line in zip(slots, self._clipped_lines(lines, clip)):
+            frame[slot] = line
+        return [entry for entry in frame if entry is not None]
+
+    def bounding_boxes(self, origin, target):
+        """
+        Returns the screen space edges of the bounding boxes of the visible
+        shapes, as (color, starts, ends) triples. Boxes crossing the near
+        plane are left out. A cheap stand-in for the scene while the full
+        frame is being drawn.
+        """
+
+        with self.lock:
+            shapes = list(self.shapes)
+
+        visible, _, _ = classify_shapes(shapes, origin, target)
+        shapes = [shapes[i] for i in np.flatnonzero(visible)]
+        if not shapes:
+            return []
+
+        lower = np.array([shape.aabb()[0] for shape in shapes])
+        upper = np.array([shape.aabb()[1] for shape in shapes])
+        matrix = camera_matrix(origin)
+        corners = box_corners(lower, upper).reshape(-1, 3)
+        corners = corners @ matrix[:3, :3] + matrix[3, :3]
+        in_front = (corners[:, 2] >= origin.near).reshape(-1, 8).all(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corners = camera_to_viewport(corners, origin, target).reshape(-1, 8, 3)
+        starts = corners[:, BOX_EDGES[:, 0]]
+        ends = corners[:, BOX_EDGES[:, 1]]
+
+        groups = {}
+        for i, shape in enumerate(shapes):
+            if in_front[i]:
+                groups.setdefault(tuple(shape.color), []).append(i)
+
+        boxes = []
+        for color, indexes in groups.items():
+            s, e = cohen_sutherland_segments(
+                starts[indexes].reshape(-1, 3), ends[indexes].reshape(-1, 3), target
+            )
+            boxes.append((color, s, e))
+        return boxes
 
-        return shapes
+    def pick(self, x, y, tolerance=5):
+        """
+        Returns the shape drawn closest to the screen point (x, y) in the
+        last frame, or None if nothing is within `tolerance` pixels.
+        """
+        # the index is only updated once per frame, on the first pick
+        frame = self.frame
+        if frame is not self.picked_frame:
+            self.picking.update(frame)
+            self.picked_frame = frame
+        return self.picking.nearest(x, y, tolerance)
+
+    def _projected(self, shapes, pool, origin, target, clip, detail):
+        """
+        Returns each of `shapes` that may be visible with its screen space
+        copy and a flag telling if the copy lies entirely inside `clip`.
+        """
+
+        screen = self._buffer("screen", len(pool.data))
+
+        visible, inside, in_depth = classify_shapes(shapes, origin, target, clip)
+        levels = self._levels_of_detail(shapes, visible, origin, target, detail)
+        parts = self._visible_parts(
+            shapes, visible, inside, in_depth, levels, origin, target, clip
+        )
+
+        indexes = np.flatnonzero(visible)
+        slices = [pool.slice_of(shapes[i]) for i in indexes]
+
+        # pool indexes of the vertices used by the visible meshlets
+        rows = {}
+        for shape, edges in parts.items():
+            used = np.zeros(len(shape.vertices), dtype=bool)
+            used[edges.ravel()] = True
+            rows[shape] = pool.slice_of(shape).start + np.flatnonzero(used)
+
+        # simplified shapes are projected on their own, outside the pool
+        pooled = [(i, s) for i, s in zip(indexes, slices) if shapes[i] not in levels]
+
+        # a few visible shapes are cheaper to project one slice at a time
+        visible_size = sum(s.stop - s.start for _, s in pooled)
+        visible_size -= sum(len(shape.vertices) - len(rows[shape]) for shape in rows)
+        sparse = visible_size < pool.size // 2
+
+        visible_shapes = [shapes[i] for i, _ in pooled] if sparse else None
+        camera = to_camera(
+            pool,
+            origin,
+            out=screen,
+            shapes=visible_shapes,
+            rows=rows,
+        )
+        if levels:
+            matrix = camera_matrix(origin)
+
+        projected = []
+        detached = []
+        for i, s in zip(indexes, slices):
+            original = shapes[i]
+
+            # shapes not bound to the pool are mapped to the viewport apart
+            own_positions = original in levels
+            if own_positions:
+                level = levels[original]
+                m = original.model_matrix @ matrix
+                shape = level.rebound(level.positions() @ m[:3, :3] + m[3, :3])
+            else:
+                shape = original.rebound(camera[s])
+                if original in parts:
+                    shape = shape.with_edges(parts[original])
+
+            if not in_depth[i]:
+                if own_positions:
+                    z = shape.positions()[:, 2]
+                else:
+                    z = camera[rows.get(original, s), 2]
+
+                if np.any((z < origin.near) | (z > origin.far)):
+                    shape = shape.clipped_depth(origin.near, origin.far)
+                    if shape is None:
+                        continue
+                    own_positions = True
+
+            if own_positions:
+                detached.append(shape)
+            projected.append((original, shape, inside[i]))
+
+        # vertices outside the depth range are never read after this point
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if sparse:
+                # the rows of every visible shape are mapped in a single call,
+                # as setting up the mapping costs more than most shapes
+                used = [
+                    rows.get(shapes[i], np.arange(s.start, s.stop)) for i, s in pooled
+                ]
+                used = np.concatenate(used) if used else np.zeros(0, dtype=int)
+                camera[used] = camera_to_viewport(camera[used], origin, target)
+            else:
+                camera_to_viewport(camera, origin, target)
+
+            if detached:
+                positions = [shape.positions() for shape in detached]
+                splits = np.cumsum([len(p) for p in positions])[:-1]
+                positions = camera_to_viewport(
+                    np.concatenate(positions), origin, target
+                )
+                for shape, p in zip(detached, np.split(positions, splits)):
+                    shape.set_positions(p)
+
+        return projected
+
+    def _levels_of_detail(self, shapes, visible, origin, target, detail):
+        """
+        Picks a simplified copy for the visible shapes that are small on
+        screen, based on the projected size of their bounding spheres.
+        """
+
+        indexes = np.flatnonzero(visible)
+        if len(indexes) == 0:
+            return {}
+
+        spheres = [shapes[i].bounding_sphere() for i in indexes]
+        centers = np.array([c for c, _ in spheres])
+        radii = np.array([r for _, r in spheres])
+        pixels = 2 * detail * screen_radii(centers, radii, origin, target)
+
+        levels = {}
+        for i, size in zip(indexes, pixels):
+            level = shapes[i].level_of_detail(size)
+            if level is not None:
+                levels[shapes[i]] = level
+        return levels
+
+    def _visible_parts(
+        self, shapes, visible, inside, in_depth, levels, origin, target, clip
+    ):
+        """
+        Culls the meshlets of the visible shapes drawn in full detail that
+        cross the border of the view, updating the flags of each shape in
+        place. Returns the edges left to draw of the shapes that are only
+        partly visible.
+        """
+
+        candidates = []
+        for i in np.flatnonzero(visible & ~inside):
+            if shapes[i] in levels:
+                continue
+            meshlets = shapes[i].meshlets()
+            if meshlets is not None:
+                candidates.append((i, meshlets))
+        if not candidates:
+            return {}
+
+        # the meshlets of every shape are classified in a single pass
+        bounds = [m.world_bounds(shapes[i].model_matrix) for i, m in candidates]
+        bounds = [np.concatenate(b) for b in zip(*bounds)]
+        flags = classify_bounds(*bounds, origin, target, clip)
+        splits = np.cumsum([len(m) for _, m in candidates])[:-1]
+        flags = [np.split(f, splits) for f in flags]
+
+        parts = {}
+        for k, (i, meshlets) in enumerate(candidates):
+            m_visible, m_inside, m_in_depth = (f[k] for f in flags)
+            if not m_visible.any():
+                visible[i] = False
+                continue
+
+            shape = shapes[i]
+            inside[i] = m_inside[m_visible].all()
+            in_depth[i] |= m_in_depth[m_visible].all()
+            if not m_visible.all():
+                parts[shape] = shape.edges[meshlets.edge_mask(m_visible)]
+
+        return parts
+
+    def _clipped_lines(self, lines, clip):
+        if not lines:
+            return []
+
+        starts = np.array([line.start.data for _, line in lines])
+        ends = np.array([line.end.data for _, line in lines])
+        u0, u1, starts, ends = liang_barsky_segments(starts, ends, clip)
+
+        # one entry per line, None for the lines outside the region
+        clipped = []
+        for i, (original, line) in enumerate(lines):
+            if u0[i] <= u1[i]:
+                line = line.rebound(np.stack((starts[i], ends[i])))
+                clipped.append((original, line))
+            else:
+                clipped.append(None)
+        return clipped
 
     def get_gliphs(self, target):
         return self.gliphs
@@ -31,4 +420,17 @@ class Scene:
     def add_shape(self, shape):
         if shape is None:
             return
-        self.shapes.append(shape)
+        with self.lock:
+            self.shapes.append(shape)
+            self.pool.add(shape)
+            self.edits += 1
+
+    def remove_shape(self, shape):
+        if shape not in self.shapes:
+            return
+        with self.lock:
+            self.shapes.remove(shape)
+            self.pool.remove(shape)
+            self.edits += 1
+            self.cache.pop(shape, None)
+            self.frame = [(o, p) for o, p in self.frame if o is not shape]
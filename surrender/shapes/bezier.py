@@ -1,7 +1,7 @@
 from surrender.shapes import Polygon, Line
 from surrender.shapes.generic_curve import GenericCurve
 from surrender.parametric_curves import bezier
-from surrender.vector import Vector
+from surrender.vector import Vector, VectorArray
 from surrender.utils import adjacents
 from surrender.clipping import sutherland_hodgeman
 
@@ -27,6 +27,9 @@ class Bezier(GenericCurve):
     def points(self):
         return self._control_points
 
+    def bind_positions(self, buffer):
+        self._control_points = list(VectorArray(buffer))
+
     def lines(self):
         for start, end in adjacents(self.blended_points(), circular=False):
             yield Line("", start, end)
@@ -44,15 +47,18 @@ class Bezier(GenericCurve):
                 points.append(Vector(x, y, z))
         return points
 
-    def clipped(self, window):
-        clipped_points = []
-
+    def update_resolution(self):
         size = 1
         for start, end in adjacents(self.points(), circular=False):
             delta = end - start
             size = max(size, delta.x, delta.y, delta.z)
         self.set_resolution(int(size) // 15 + 1)
 
+    def clipped(self, window):
+        clipped_points = []
+
+        self.update_resolution()
+
         if self.CLIPPING_ALGORITHM == self.DO_NOT_CLIP:
             return self
 
@@ -13,27 +13,23 @@ class BicubicBspline(Object3D):
         self.set_segments(segments)
 
     def copy(self):
-        new_control_points = []
-        new_segments = [(a.copy(), b.copy()) for a, b in self.segments]
-
-        for line in self.control_points:
-            new_line = []
-            for p in line:
-                new_line.append(p.copy())
-            new_control_points.append(new_line)
-
-        c = self.__class__(self.name, [], self.color)
-        c.control_points = new_control_points
-        c.set_segments(new_segments)
+        c = super().copy()
+        c.control_points = [[p.copy() for p in line] for line in self.control_points]
         return c
 
     def points(self):
-        points = self.visual_points
+        points = super().points()
         for line in self.control_points:
             for p in line:
                 points.append(p)
         return points
 
+    def apply_transform(self, matrix):
+        super().apply_transform(matrix)
+        for line in self.control_points:
+            for p in line:
+                p.apply_transform(matrix)
+
     def generate_segments(self, control_points, resolution=1):
         segments = []
         last_vectors = []
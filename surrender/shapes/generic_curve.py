@@ -1,4 +1,7 @@
+import numpy as np
+
 from surrender.shapes.generic_shape import GenericShape
+from surrender.shapes.polygon import Polygon
 
 
 class GenericCurve(GenericShape):
@@ -14,3 +17,16 @@ class GenericCurve(GenericShape):
     def __init__(self, name, color=(0, 0, 0), style=CLOSED):
         super().__init__(name, "Curve", color)
         self.style = style
+
+    def unclipped(self, window):
+        self.update_resolution()
+        return self
+
+    def clipped_depth(self, near, far):
+        z = self.positions()[:, 2]
+        if np.all((z >= near) & (z <= far)):
+            return self
+
+        polygon = Polygon(self.name, self.blended_points(), self.color, Polygon.OPEN)
+        polygon.CLIPPING_ALGORITHM = self.CLIPPING_ALGORITHM
+        return polygon.clipped_depth(near, far)
@@ -1,6 +1,24 @@
-from copy import deepcopy
+from copy import deepcopy, copy as shallow_copy
+from itertools import count
+
+import numpy as np
+
 from surrender.vector import Vector
 from surrender.projection import viewport_transform
+from surrender.culling import transform_bounds
+from surrender.math_transforms import (
+    translation_matrix,
+    scale_matrix,
+    rotation_matrix,
+    rotation_matrix_x,
+    rotation_matrix_y,
+    rotation_matrix_z,
+    around_matrix,
+)
+
+# versions are drawn from a single counter so no two states of any two
+# shapes ever share one
+_versions = count()
 
 
 class GenericShape:
@@ -8,19 +26,162 @@ class GenericShape:
         self.name = name
         self.type = objtype
         self.color = color
+        self.model_matrix = np.identity(4)
+        self.version = next(_versions)
+        self.geometry_version = self.version
+        self._bounds = None
+        self._world_bounds = None
 
     def clipped(self, window):
         return self
 
+    def unclipped(self, window):
+        """
+        Returns the shape ready to be drawn when it is known to lie
+        entirely inside `window`.
+        """
+        return self
+
+    def clipped_depth(self, near, far):
+        z = self.positions()[:, 2]
+        if np.all((z >= near) & (z <= far)):
+            return self
+        return None
+
     def copy(self):
         return deepcopy(self)
 
     def points(self):
         return []
 
+    def positions(self):
+        coords = [p.data for p in self.points()]
+        return np.array(coords, dtype=float).reshape(-1, 3)
+
+    def set_positions(self, positions):
+        for p, row in zip(self.points(), positions):
+            p.data[:] = row
+        self.invalidate_bounds()
+
+    def bind_positions(self, buffer):
+        """
+        Makes the points of the shape views into the rows of `buffer`,
+        which must already hold their coordinates.
+        """
+        for p, row in zip(self.points(), buffer):
+            p.data = row
+
+    def world_positions(self):
+        positions = self.positions()
+        matrix = self.model_matrix
+        return positions @ matrix[:3, :3] + matrix[3, :3]
+
+    def rebound(self, buffer):
+        """
+        Returns a shallow copy of the shape whose points are views into
+        `buffer`, leaving the shape itself untouched.
+        """
+        c = shallow_copy(self)
+        c.model_matrix = np.identity(4)
+        c.bind_positions(buffer)
+        c.invalidate_bounds()
+        return c
+
+    def invalidate_bounds(self):
+        """
+        Drops the cached bounds and bumps the version of the shape. Called
+        whenever the geometry changes through the shape, and must be called
+        by hand after moving its points directly.
+        """
+        self.version = next(_versions)
+        self.geometry_version = self.version
+        self._bounds = None
+        self._world_bounds = None
+
+    # cached values are kept with the version they were computed for, and
+    # only read back while it is current, as a render thread may compute
+    # them while the shape is being changed
+
+    def _local_bounds(self):
+        version = self.geometry_version
+        if self._bounds is not None and self._bounds[0] == version:
+            return self._bounds[1]
+
+        bounds = None
+        positions = self.positions()
+        if len(positions) > 0:
+            lower = positions.min(axis=0)
+            upper = positions.max(axis=0)
+            center = (lower + upper) / 2
+            radius = np.linalg.norm(positions - center, axis=1).max()
+            bounds = (lower, upper, center, radius)
+
+        self._bounds = (version, bounds)
+        return bounds
+
+    def _cached_world_bounds(self):
+        version = self.version
+        if self._world_bounds is not None and self._world_bounds[0] == version:
+            return self._world_bounds[1]
+
+        world = None
+        bounds = self._local_bounds()
+        if bounds is not None:
+            lower, upper, center, radius = bounds
+            lower, upper, center, radius = transform_bounds(
+                lower[None], upper[None], center[None], radius, self.model_matrix
+            )
+            world = (lower[0], upper[0], center[0], radius)
+
+        self._world_bounds = (version, world)
+        return world
+
+    def aabb(self):
+        bounds = self._cached_world_bounds()
+        if bounds is None:
+            return None
+        return bounds[0], bounds[1]
+
+    def bounding_sphere(self):
+        bounds = self._cached_world_bounds()
+        if bounds is None:
+            return None
+        return bounds[2], bounds[3]
+
+    def meshlets(self):
+        """
+        Returns the Meshlets splitting the shape for partial culling, or
+        None for shapes that are always culled as a whole.
+        """
+        return None
+
+    def level_of_detail(self, pixels):
+        """
+        Returns a simplified copy of the shape good enough to be drawn
+        `pixels` wide, or None if the shape itself should be drawn.
+        """
+        return None
+
     def apply_transform(self, matrix):
-        for p in self.points():
-            p.apply_transform(matrix)
+        positions = self.positions()
+        if len(positions) == 0:
+            return
+        self.set_positions(positions @ matrix[:3, :3] + matrix[3, :3])
+
+    def transform(self, matrix):
+        """
+        Composes `matrix` onto the model matrix of the shape. The geometry
+        itself is only touched when the shape is projected or baked.
+        """
+        self.model_matrix = self.model_matrix @ matrix
+        self.version = next(_versions)
+        self._world_bounds = None
+
+    def bake_transform(self):
+        if np.array_equal(self.model_matrix, np.identity(4)):
+            return
+        self.apply_transform(self.model_matrix)
+        self.model_matrix = np.identity(4)
 
     def change_viewport(self, source, target):
         for p in self.points():
@@ -28,36 +189,25 @@ class GenericShape:
         return self
 
     def center(self):
-        pts = self.points()
-        s = Vector(0, 0, 0)
-
-        for p in pts:
-            s += p
-
-        if pts:
-            s /= len(pts)
-        return s
+        positions = self.world_positions()
+        if len(positions) == 0:
+            return Vector(0, 0, 0)
+        return Vector(*positions.mean(axis=0))
 
     def move(self, vector):
-        for p in self.points():
-            p.move(vector)
+        self.transform(translation_matrix(vector))
 
     def scale(self, vector, around=None):
-        for p in self.points():
-            p.scale(vector, around)
+        self.transform(around_matrix(scale_matrix(vector), around))
 
     def rotate_x(self, angle, around=None):
-        for p in self.points():
-            p.rotate_x(angle, around)
+        self.transform(around_matrix(rotation_matrix_x(angle), around))
 
     def rotate_y(self, angle, around=None):
-        for p in self.points():
-            p.rotate_y(angle, around)
+        self.transform(around_matrix(rotation_matrix_y(angle), around))
 
     def rotate_z(self, angle, around=None):
-        for p in self.points():
-            p.rotate_z(angle, around)
+        self.transform(around_matrix(rotation_matrix_z(angle), around))
 
     def rotate(self, delta, around=None):
-        for p in self.points():
-            p.rotate(delta, around)
+        self.transform(around_matrix(rotation_matrix(delta), around))
@@ -1,7 +1,10 @@
 from copy import deepcopy
 
+import numpy as np
+
 from surrender.shapes.generic_shape import GenericShape
-from surrender.clipping import cohen_sutherland, liang_barsky
+from surrender.vector import Vector
+from surrender.clipping import cohen_sutherland, liang_barsky, clip_segments_depth
 
 
 class Line(GenericShape):
@@ -19,6 +22,17 @@ class Line(GenericShape):
     def points(self):
         return [self.start, self.end]
 
+    def bind_positions(self, buffer):
+        self.start = Vector.view(buffer[0])
+        self.end = Vector.view(buffer[1])
+
+    def clipped_depth(self, near, far):
+        positions = self.positions()
+        starts, ends = clip_segments_depth(positions[:1], positions[1:], near, far)
+        if len(starts) == 0:
+            return None
+        return self.rebound(np.concatenate((starts, ends)))
+
     def clipped(self, window):
         if self.CLIPPING_ALGORITHM == self.COHEN_SUTHERLAND:
             p = cohen_sutherland(self.start, self.end, window)
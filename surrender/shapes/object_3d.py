@@ -1,40 +1,182 @@
+from copy import copy as shallow_copy
+
+import numpy as np
+
 from surrender.shapes.generic_shape import GenericShape
 from surrender.shapes import Line
-from surrender.clipping import cohen_sutherland
+from surrender.clipping import cohen_sutherland_segments, clip_segments_depth
+from surrender.vector import VectorArray
+from surrender.meshlets import Meshlets
+from surrender.simplify import cluster_vertices
 
 
 class Object3D(GenericShape):
+    """
+    A wireframe stored as indexed geometry: `vertices` is a VectorArray
+    with every unique vertex once and `edges` is a (M, 2) integer array
+    of indexes into it. Objects imported from faces also keep `faces`, a
+    pair of arrays (offsets, edges) listing the edges of face i as
+    edges[offsets[i]:offsets[i + 1]].
+    """
+
+    # smaller meshes are cheaper to cull as a whole
+    MESHLET_MIN_EDGES = 4096
+
+    # cells along the largest side of each simplified level, and the size
+    # in pixels a cell may take on screen before a finer level is used
+    LOD_MIN_EDGES = 512
+    LOD_RESOLUTIONS = (8, 16, 32, 64, 128)
+    LOD_PIXEL_ERROR = 2
+
     def __init__(self, name, segments, color=(0, 0, 0)):
         super().__init__(name, "Object3D", color)
-        self.segments = list()
-        self.visual_points = list()
+        self._meshlets = None
+        self._lods = None
+        self.faces = None
+        self.vertices = VectorArray()
+        self.edges = np.zeros((0, 2), dtype=np.int32)
         self.set_segments(segments)
 
+    @classmethod
+    def from_arrays(cls, name, vertices, edges, color=(0, 0, 0), faces=None):
+        obj = Object3D(name, [], color)
+        obj.set_geometry(vertices, edges)
+        obj.faces = faces
+        return obj
+
     def copy(self):
-        new_segments = [(a.copy(), b.copy()) for a, b in self.segments]
-        return self.__class__(self.name, new_segments, self.color)
+        c = shallow_copy(self)
+        c.vertices = self.vertices.copy()
+        c.edges = self.edges.copy()
+        return c
+
+    def set_geometry(self, vertices, edges):
+        self.vertices = VectorArray(vertices)
+        self.edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        self.faces = None
+        self.invalidate_bounds()
 
     def set_segments(self, segments):
-        self.visual_points.clear()
-        self.segments = list(segments)
+        coords = [p.data for segment in segments for p in segment]
+        coords = np.array(coords, dtype=float).reshape(-1, 3)
+        vertices, inverse = np.unique(coords, axis=0, return_inverse=True)
+        self.set_geometry(vertices, inverse)
 
-        for a, b in segments:
-            self.visual_points.append(a)
-            self.visual_points.append(b)
+    def invalidate_bounds(self):
+        super().invalidate_bounds()
+        self._meshlets = None
+        self._lods = None
 
-    def clipped(self, window):
-        new_segments = []
-        for a, b in self.segments:
-            line = cohen_sutherland(a, b, window)
-            if line is not None:
-                new_segments.append(line)
-        c = self.copy()
-        c.set_segments(new_segments)
+    def meshlets(self):
+        """
+        Builds the meshlets of large objects on first use.
+        """
+        version = self.geometry_version
+        if self._meshlets is not None and self._meshlets[0] == version:
+            return self._meshlets[1]
+
+        meshlets = None
+        if len(self.edges) >= self.MESHLET_MIN_EDGES:
+            meshlets = Meshlets(self.vertices.data, self.edges)
+        self._meshlets = (version, meshlets)
+        return meshlets
+
+    def lods(self):
+        """
+        Builds the chain of simplified copies of large objects on first
+        use, as (resolution, copy) pairs from the coarsest to the finest.
+        Levels that barely simplify the next finer one are left out.
+        """
+        version = self.geometry_version
+        if self._lods is not None and self._lods[0] == version:
+            return self._lods[1]
+
+        lods = []
+        if len(self.edges) >= self.LOD_MIN_EDGES:
+            finer = len(self.edges)
+            for resolution in reversed(self.LOD_RESOLUTIONS):
+                vertices, edges = cluster_vertices(
+                    self.vertices.data, self.edges, resolution
+                )
+                if len(edges) > 0.75 * finer:
+                    continue
+                lods.insert(0, (resolution, self.with_geometry(vertices, edges)))
+                finer = len(edges)
+        self._lods = (version, lods)
+        return lods
+
+    def level_of_detail(self, pixels):
+        # the chain is only built once some level is coarse enough
+        if pixels / max(self.LOD_RESOLUTIONS) > self.LOD_PIXEL_ERROR:
+            return None
+        for resolution, level in self.lods():
+            if pixels / resolution <= self.LOD_PIXEL_ERROR:
+                return level
+        return None
+
+    def with_geometry(self, vertices, edges):
+        """
+        Returns a shallow copy of the object with the given geometry.
+        """
+        c = shallow_copy(self)
+        c.set_geometry(vertices, edges)
+        return c
+
+    def with_edges(self, edges):
+        """
+        Returns a shallow copy of the object sharing its vertices but
+        drawing only the given edges.
+        """
+        c = shallow_copy(self)
+        c.edges = edges
+        c.faces = None
+        c.invalidate_bounds()
         return c
 
+    def segments(self):
+        for a, b in self.edges:
+            yield self.vertices[a], self.vertices[b]
+
+    def with_segments(self, starts, ends):
+        """
+        Returns a shallow copy of the object made of the given arrays of
+        segment starts and ends.
+        """
+        n = len(starts)
+        return self.with_geometry(
+            np.concatenate((starts, ends)),
+            np.column_stack((np.arange(n), np.arange(n, 2 * n))),
+        )
+
+    def clipped_depth(self, near, far):
+        vertices = self.vertices.data
+        starts = vertices[self.edges[:, 0]]
+        ends = vertices[self.edges[:, 1]]
+        starts, ends = clip_segments_depth(starts, ends, near, far)
+        if len(starts) == 0:
+            return None
+        return self.with_segments(starts, ends)
+
+    def clipped(self, window):
+        vertices = self.vertices.data
+        starts = vertices[self.edges[:, 0]]
+        ends = vertices[self.edges[:, 1]]
+        starts, ends = cohen_sutherland_segments(starts, ends, window)
+        return self.with_segments(starts, ends)
+
     def points(self):
-        return self.visual_points
+        return list(self.vertices)
+
+    def positions(self):
+        return self.vertices.data
+
+    def set_positions(self, positions):
+        self.vertices.data[:] = positions
+        self.invalidate_bounds()
+
+    def bind_positions(self, buffer):
+        self.vertices = VectorArray(buffer)
 
     def as_lines(self):
-        for a, b in self.segments:
+        for a, b in self.segments():
             yield Line("", a, b, self.color)
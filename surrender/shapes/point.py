@@ -1,6 +1,7 @@
 from copy import deepcopy
 
 from surrender.shapes.generic_shape import GenericShape
+from surrender.vector import Vector
 
 
 class Point(GenericShape):
@@ -15,6 +16,9 @@ class Point(GenericShape):
     def points(self):
         return [self.pos]
 
+    def bind_positions(self, buffer):
+        self.pos = Vector.view(buffer[0])
+
     def clipped(self, window):
         if self.CLIPPING_ALGORITHM == self.DO_NOT_CLIP:
             return self
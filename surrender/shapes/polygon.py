@@ -1,9 +1,17 @@
 from copy import deepcopy
 
+import numpy as np
+
 from surrender.shapes.generic_shape import GenericShape
 from surrender.shapes import Line
-from surrender.clipping import sutherland_hodgeman
+from surrender.clipping import (
+    sutherland_hodgeman,
+    clip_polygon_depth,
+    clip_polyline_depth,
+)
+from surrender.shapes.object_3d import Object3D
 from surrender.utils import adjacents
+from surrender.vector import VectorArray
 
 
 class Polygon(GenericShape):
@@ -24,11 +32,39 @@ class Polygon(GenericShape):
     def points(self):
         return self.pts
 
+    def bind_positions(self, buffer):
+        self.pts = list(VectorArray(buffer))
+
     def lines(self):
         circular = self.style != self.OPEN
         for start, end in adjacents(self.points(), circular=circular):
             yield Line("", start, end)
 
+    def clipped_depth(self, near, far):
+        if self.style & self.CLOSED:
+            points = clip_polygon_depth(self.positions(), near, far)
+            if len(points) == 0:
+                return None
+            return self.rebound(points)
+
+        runs = clip_polyline_depth(self.positions(), near, far)
+        if len(runs) == 0:
+            return None
+        if len(runs) == 1:
+            return self.rebound(runs[0])
+
+        # a path leaving the depth range and coming back is split in runs,
+        # kept apart as the segments of a mesh
+        edges = []
+        offset = 0
+        for run in runs:
+            indexes = offset + np.arange(len(run))
+            edges.append(np.column_stack((indexes[:-1], indexes[1:])))
+            offset += len(run)
+        return Object3D.from_arrays(
+            self.name, np.concatenate(runs), np.concatenate(edges), self.color
+        )
+
     def clipped(self, window):
         clipped_points = []
 
@@ -0,0 +1,36 @@
+import numpy as np
+
+from surrender.utils import unique_edges
+
+
+def cluster_vertices(vertices, edges, resolution):
+    """
+    Simplifies an indexed wireframe by vertex clustering: the bounding
+    box is split into cubic cells, `resolution` of them along its largest
+    side, and all vertices in a cell are merged into their mean. Edges
+    collapsed into a single cluster and repeated edges are dropped.
+    """
+
+    lower = vertices.min(axis=0)
+    extent = (vertices.max(axis=0) - lower).max()
+    if extent == 0:
+        return vertices[:1].copy(), np.zeros((0, 2), dtype=np.int32)
+
+    cells = np.floor((vertices - lower) / extent * resolution).astype(np.int64)
+    cells = np.minimum(cells, resolution - 1)
+    keys = (cells[:, 0] * resolution + cells[:, 1]) * resolution + cells[:, 2]
+    _, cluster, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    cluster = cluster.ravel()
+
+    merged = np.column_stack(
+        [np.bincount(cluster, vertices[:, i], len(counts)) for i in range(3)]
+    )
+    merged /= counts[:, None]
+
+    edges = cluster[edges]
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    edges, _ = unique_edges(edges, len(counts))
+
+    # clusters left without edges are dropped
+    used, edges = np.unique(edges, return_inverse=True)
+    return merged[used], edges.reshape(-1, 2).astype(np.int32)
@@ -1,5 +1,10 @@
+from PyQt5.QtCore import Qt
 from surrender.tools.tool import Tool
 
 
 class SelectionTool(Tool):
-    pass
+    cursor = Qt.PointingHandCursor
+
+    def mousePressEvent(self, event):
+        shape = self.viewport.scene.pick(event.x(), event.y())
+        self.viewport.select_shape(shape)
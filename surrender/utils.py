@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def adjacents(sequence, circular=False):
     if not sequence:
         return None
@@ -21,3 +24,19 @@ def group_by(sequence, group_size):
             yield output
     except StopIteration:
         pass
+
+
+def unique_edges(edges, n=None):
+    """
+    Deduplicates an (M, 2) array of index pairs regardless of direction.
+    Returns the unique pairs, each with its smaller index first, and the
+    position of every input pair among them.
+    """
+
+    edges = np.sort(np.asarray(edges, dtype=np.int64).reshape(-1, 2), axis=1)
+    if n is None:
+        n = edges.max() + 1 if len(edges) else 1
+
+    keys, inverse = np.unique(edges[:, 0] * n + edges[:, 1], return_inverse=True)
+    unique = np.column_stack((keys // n, keys % n))
+    return unique, inverse.ravel()
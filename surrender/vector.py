@@ -2,9 +2,11 @@ import numpy as np
 from surrender.math_transforms import (
     translation_matrix,
     scale_matrix,
+    rotation_matrix,
     rotation_matrix_x,
     rotation_matrix_y,
     rotation_matrix_z,
+    around_matrix,
 )
 
 
@@ -19,24 +21,8 @@ def implements(np_function):
     return decorator
 
 
-class Vector(np.lib.mixins.NDArrayOperatorsMixin):
-    def __init__(self, x=0, y=0, z=0):
-        self.x = x
-        self.y = y
-        self.z = z
-
-    def length(self):
-        return np.linalg.norm(np.asarray(self))
-
-    def normalized(self):
-        return self / self.length()
-
-    def apply_transform(self, matrix):
-        array = np.array([self.x, self.y, self.z, 1])
-        x, y, z, _ = array @ matrix
-        self.x = x
-        self.y = y
-        self.z = z
+class TransformMixin:
+    __slots__ = ()
 
     def move(self, vector):
         matrix = translation_matrix(vector)
@@ -44,59 +30,82 @@ class Vector(np.lib.mixins.NDArrayOperatorsMixin):
         return self
 
     def scale(self, vector, around=None):
-        if around is None:
-            around = Vector(0, 0)
-
-        t0 = translation_matrix(-around)
-        t1 = translation_matrix(around)
-        s = scale_matrix(vector)
-
-        matrix = t0 @ s @ t1
+        matrix = around_matrix(scale_matrix(vector), around)
         self.apply_transform(matrix)
         return self
 
     def rotate_x(self, angle, around=None):
-        if around is None:
-            around = Vector(0, 0)
-
-        t0 = translation_matrix(-around)
-        t1 = translation_matrix(around)
-        r = rotation_matrix_x(angle)
-
-        matrix = t0 @ r @ t1
+        matrix = around_matrix(rotation_matrix_x(angle), around)
         self.apply_transform(matrix)
         return self
 
     def rotate_y(self, angle, around=None):
-        if around is None:
-            around = Vector(0, 0)
-
-        t0 = translation_matrix(-around)
-        t1 = translation_matrix(around)
-        r = rotation_matrix_y(angle)
-
-        matrix = t0 @ r @ t1
+        matrix = around_matrix(rotation_matrix_y(angle), around)
         self.apply_transform(matrix)
         return self
 
     def rotate_z(self, angle, around=None):
-        if around is None:
-            around = Vector(0, 0)
-
-        t0 = translation_matrix(-around)
-        t1 = translation_matrix(around)
-        r = rotation_matrix_z(angle)
-
-        matrix = t0 @ r @ t1
+        matrix = around_matrix(rotation_matrix_z(angle), around)
         self.apply_transform(matrix)
         return self
 
     def rotate(self, delta, around=None):
-        self.rotate_x(delta.x, around)
-        self.rotate_y(delta.y, around)
-        self.rotate_z(delta.z, around)
+        matrix = around_matrix(rotation_matrix(delta), around)
+        self.apply_transform(matrix)
         return self
 
+
+class Vector(TransformMixin, np.lib.mixins.NDArrayOperatorsMixin):
+    """
+    A 3D point. The coordinates live in `data`, which is either a buffer
+    of its own or a row of a VectorArray (see `Vector.view`), so changing
+    the vector changes the array as well.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, x=0, y=0, z=0):
+        self.data = np.array([x, y, z], dtype=float)
+
+    @classmethod
+    def view(cls, row):
+        vector = cls.__new__(cls)
+        vector.data = row
+        return vector
+
+    @property
+    def x(self):
+        return self.data[0]
+
+    @x.setter
+    def x(self, value):
+        self.data[0] = value
+
+    @property
+    def y(self):
+        return self.data[1]
+
+    @y.setter
+    def y(self, value):
+        self.data[1] = value
+
+    @property
+    def z(self):
+        return self.data[2]
+
+    @z.setter
+    def z(self, value):
+        self.data[2] = value
+
+    def length(self):
+        return np.linalg.norm(self.data)
+
+    def normalized(self):
+        return self / self.length()
+
+    def apply_transform(self, matrix):
+        self.data[:] = self.data @ matrix[:3, :3] + matrix[3, :3]
+
     def angle_with(self, other):
         if self.length() == 0 or other.length() == 0:
             return 0
@@ -141,7 +150,7 @@ class Vector(np.lib.mixins.NDArrayOperatorsMixin):
         return np.append(a, values, axis=axis)
 
     def copy(self):
-        return self.__class__(self.x, self.y, self.z)
+        return self.__class__(*self.data)
 
     def __hash__(self):
         return id(self)
@@ -149,8 +158,8 @@ class Vector(np.lib.mixins.NDArrayOperatorsMixin):
     def __repr__(self):
         return f"Vector({self.x :.2f}, {self.y :.2f}, {self.z :.2f})"
 
-    def __array__(self, dtype=None):
-        return np.array([self.x, self.y, self.z], dtype=dtype)
+    def __array__(self, dtype=None, copy=None):
+        return np.array(self.data, dtype=dtype)
 
     def __array_ufunc__(self, ufunc, method, *args, **kwargs):
         out = kwargs.get("out", None)
@@ -168,7 +177,7 @@ class Vector(np.lib.mixins.NDArrayOperatorsMixin):
                 if isinstance(i, np.ndarray):
                     i[:3] = x, y, z
                 elif isinstance(i, __class__):
-                    i.x, i.y, i.z = x, y, z
+                    i.data[:] = x, y, z
                 else:
                     return NotImplemented
             return result
@@ -184,3 +193,71 @@ class Vector(np.lib.mixins.NDArrayOperatorsMixin):
             return NotImplemented
 
         return HANDLED_FUNCTIONS[func](*args, **kwargs)
+
+
+class VectorArray(TransformMixin):
+    """
+    A batch of 3D points stored in a single (N, 3) float buffer. It has
+    the same transform API as Vector, applied to every row at once, and
+    indexing it gives Vector views into the buffer.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data=None):
+        if data is None:
+            data = np.zeros((0, 3))
+        self.data = np.asarray(data, dtype=float).reshape(-1, 3)
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        return cls([v.data for v in vectors])
+
+    def apply_transform(self, matrix):
+        self.data[:] = self.data @ matrix[:3, :3] + matrix[3, :3]
+
+    def length(self):
+        return np.linalg.norm(self.data, axis=1)
+
+    def normalized(self):
+        lengths = self.length()
+        lengths[lengths == 0] = 1
+        return self.__class__(self.data / lengths[:, None])
+
+    def dot(self, other):
+        return np.einsum("ij,ij->i", self.data, self._broadcast(other))
+
+    def cross(self, other):
+        return self.__class__(np.cross(self.data, self._broadcast(other)))
+
+    def center(self):
+        if len(self) == 0:
+            return Vector(0, 0, 0)
+        return Vector(*self.data.mean(axis=0))
+
+    def copy(self):
+        return self.__class__(self.data.copy())
+
+    def _broadcast(self, other):
+        other = np.asarray(other, dtype=float)
+        return np.broadcast_to(other, self.data.shape)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Vector.view(self.data[index])
+        return self.__class__(self.data[index])
+
+    def __iter__(self):
+        for row in self.data:
+            yield Vector.view(row)
+
+    def __repr__(self):
+        return f"VectorArray({len(self)} vectors)"
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None and not copy:
+            return self.data
+        return np.array(self.data, dtype=dtype)
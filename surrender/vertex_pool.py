@@ -0,0 +1,92 @@
+import numpy as np
+
+
+class VertexPool:
+    """
+    One growable (N, 3) buffer holding the raw geometry of every shape in
+    a scene. Each shape is bound to its own slice of the buffer, so its
+    points are views into the pool and the whole scene can be transformed
+    with a single matrix product.
+    """
+
+    def __init__(self, capacity=1024):
+        self.data = np.zeros((capacity, 3))
+        self.size = 0
+        self.slices = {}
+
+    def positions(self):
+        return self.data[: self.size]
+
+    def slice_of(self, shape):
+        return self.slices[shape]
+
+    def snapshot(self, out):
+        """
+        Copies the rows in use into `out`, which must have room for the
+        whole capacity of the pool, and returns them as a PoolSnapshot.
+        """
+        out[: self.size] = self.data[: self.size]
+        return PoolSnapshot(out, self.size, dict(self.slices))
+
+    def add(self, shape):
+        positions = np.array(shape.positions(), dtype=float).reshape(-1, 3)
+        n = len(positions)
+        self._reserve(self.size + n)
+
+        s = slice(self.size, self.size + n)
+        self.data[s] = positions
+        self.size += n
+
+        self.slices[shape] = s
+        shape.bind_positions(self.data[s])
+
+    def remove(self, shape):
+        s = self.slices.pop(shape)
+        shape.bind_positions(self.data[s].copy())
+
+        # the rows are compacted into a new buffer, so the points of the
+        # other shapes never show rows being moved while they are read
+        n = s.stop - s.start
+        data = np.zeros_like(self.data)
+        data[: s.start] = self.data[: s.start]
+        data[s.start : self.size - n] = self.data[s.stop : self.size]
+        self.data = data
+        self.size -= n
+
+        for other, o in self.slices.items():
+            if o.start >= s.stop:
+                o = slice(o.start - n, o.stop - n)
+                self.slices[other] = o
+            other.bind_positions(self.data[o])
+
+    def _reserve(self, size):
+        capacity = len(self.data)
+        if size <= capacity:
+            return
+
+        capacity = max(size, 2 * capacity)
+
+        data = np.zeros((capacity, 3))
+        data[: self.size] = self.data[: self.size]
+        self.data = data
+
+        for shape, s in self.slices.items():
+            shape.bind_positions(self.data[s])
+
+
+class PoolSnapshot:
+    """
+    The rows and slices of a VertexPool at one point in time, projected
+    while the pool itself may keep changing.
+    """
+
+    def __init__(self, data, size, slices):
+        self.data = data
+        self.size = size
+        self.slices = slices
+
+    def positions(self):
+        return self.data[: self.size]
+
+    def slice_of(self, shape):
+        return self.slices[shape]
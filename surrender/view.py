@@ -4,7 +4,7 @@ from surrender.shapes import Polygon
 
 
 class View(Polygon):
-    def __init__(self, p0, p1, p2, p3, projection_distance=1000):
+    def __init__(self, p0, p1, p2, p3, projection_distance=1000, near=1, far=1_000_000):
         """
         p0 ------ p1
         |          |
@@ -18,6 +18,8 @@ class View(Polygon):
         self.p2 = p2
         self.p3 = p3
         self.projection_distance = projection_distance
+        self.near = near
+        self.far = far
 
         points = [self.p0, self.p1, self.p2, self.p3]
         super().__init__("", points, style=Polygon.CLOSED)
@@ -63,6 +65,13 @@ class View(Polygon):
     def height(self):
         return (self.p0 - self.p3).length()
 
+    def transform(self, matrix):
+        """
+        The projection reads the window corners directly, so the window
+        is transformed right away instead of accumulating a model matrix.
+        """
+        self.apply_transform(matrix)
+
     def move(self, vector):
         """
         The user don't want to move the window according to
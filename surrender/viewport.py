@@ -1,20 +1,18 @@
-from PyQt5 import QtGui, QtCore
-from PyQt5.QtGui import QPainter, QBrush, QPen, QColor
-from PyQt5.QtCore import Qt, pyqtSignal
+import time
+from functools import partial
+
+import numpy as np
+from PyQt5.QtGui import QPainter, QPen, QColor, QImage
+from PyQt5.QtCore import Qt, QRect, QTimer, pyqtSignal
 from PyQt5.QtWidgets import QWidget
 from surrender.view import View
 from surrender.scene import Scene
 from surrender.vector import Vector
 from surrender.io.obj_io import OBJIO
-from surrender.shapes import (
-    Point,
-    Line,
-    Polygon,
-    Object3D,
-    BSpline,
-    BicubicBezier,
-    Bezier,
-)
+from surrender.render_thread import RenderWorker, FrameResult
+from surrender import constants, drawing, raster
+from surrender.math_transforms import around_matrix, rotation_matrix
+from surrender.shapes import Point
 
 
 class Viewport(QWidget):
@@ -28,10 +26,54 @@ class Viewport(QWidget):
         self.selected_shape = None
         self.current_tool = None
 
+        # the scene is drawn into `backing` and blitted to the widget, pans
+        # shift it by `pending_pan` pixels until the gesture settles. Only
+        # whole pixels are shifted, the rest is kept in `pan_remainder`
+        self.backing = None
+        self.pending_pan = None
+        self.pan_remainder = (0, 0)
+
+        # the software rasterizer draws into `pixels`, an (H, W, 3) array
+        # the backing store wraps without copying
+        self.software = False
+        self.pixels = None
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(constants.PAN_SETTLE_TIME)
+        self.settle_timer.timeout.connect(self.update)
+
+        # while shown, frames are projected on a render thread and drawn
+        # once they arrive, dropping those of outdated camera states
+        self.threaded = True
+        self.ready_frame = None
+        self.renderer = RenderWorker(self.scene)
+        self.renderer.finished.connect(self.frame_ready)
+        # a partial keeps the worker alive until the widget is gone
+        self.destroyed.connect(partial(RenderWorker.stop, self.renderer))
+
+        # camera changes are gathered and applied at most once per refresh
+        # of the display, whatever the rate of input events. Runs of
+        # changes of the same kind are merged, in the order they came
+        self.pending_changes = []
+        self.last_flush = 0
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.timeout.connect(self.flush)
+
+        # in progressive mode a frame starts as the bounding boxes of the
+        # shapes and is refined pass by pass while the camera stays still
+        self.progressive = False
+        self.refinement = None
+        self.refined = None
+        self.refine_timer = QTimer(self)
+        self.refine_timer.setSingleShot(True)
+        self.refine_timer.setInterval(constants.REFINE_DELAY)
+        self.refine_timer.timeout.connect(self.refine)
+
     def open(self, path):
         new_shapes = OBJIO.read(path)
         for shape in new_shapes:
-            self.scene.shapes.append(shape)
+            self.scene.add_shape(shape)
         self.shapeModified.emit()
 
     def save(self, path):
@@ -42,101 +84,143 @@ class Viewport(QWidget):
             return None
         return self.scene.shapes[index]
 
+    def select_shape(self, shape):
+        self.selected_shape = shape
+        self.shapeSelected.emit()
+
     def add_shape(self, shape):
-        if shape is not None:
-            self.scene.shapes.append(shape)
+        self.scene.add_shape(shape)
         self.shapeModified.emit()
         self.repaint()
 
     def remove_shape(self, shape):
-        if shape in self.scene.shapes:
-            self.scene.shapes.remove(shape)
+        self.scene.remove_shape(shape)
         self.shapeModified.emit()
         self.repaint()
 
     def zoom(self, factor):
-        self.win.zoom(factor)
-        self.repaint()
-        self.moved.emit()
+        self.queue_change("zoom", factor)
 
     def rotate(self, delta):
-        self.win.rotate(delta, self.win.center())
-        self.repaint()
-        self.moved.emit()
+        self.queue_change("rotate", rotation_matrix(delta))
 
     def move(self, vector):
+        self.queue_change("move", vector)
+
+    def queue_change(self, kind, value):
+        if self.pending_changes and self.pending_changes[-1][0] == kind:
+            last = self.pending_changes[-1][1]
+            if kind == "zoom":
+                value = last * value
+            elif kind == "rotate":
+                value = last @ value
+            else:
+                value = last + value
+            self.pending_changes[-1] = (kind, value)
+        else:
+            self.pending_changes.append((kind, value))
+        self.schedule_frame()
+
+    def schedule_frame(self):
+        if self.frame_timer.isActive():
+            return
+
+        screen = self.screen()
+        rate = screen.refreshRate() if screen is not None else 0
+        interval = 1000 / (rate or 60)
+
+        elapsed = (time.monotonic() - self.last_flush) * 1000
+        self.frame_timer.start(int(max(0, interval - elapsed)))
+
+    def flush(self):
+        """
+        Applies the camera changes gathered since the last frame and asks
+        for a repaint.
+        """
+        if self.apply_camera_changes():
+            self.update()
+            self.moved.emit()
+
+    def apply_camera_changes(self):
+        self.frame_timer.stop()
+
+        changes = self.pending_changes
+        if not changes:
+            return False
+
+        self.pending_changes = []
+        self.last_flush = time.monotonic()
+
+        # a frame not drawn yet is of the previous camera
+        self.ready_frame = None
+        self.refine_timer.stop()
+        self.refinement = None
+
+        # anything but a pan needs a full render
+        full = False
+        for kind, value in changes:
+            if kind == "move":
+                self.move_camera(value)
+            elif kind == "zoom":
+                self.win.zoom(value)
+                full = True
+            else:
+                self.win.transform(around_matrix(value, self.win.center()))
+                full = True
+
+        if full:
+            self.pending_pan = None
+        return True
+
+    def move_camera(self, vector):
         scalar = self.win.width() / self.vp.width()
         self.win.move(vector * scalar)
-        self.repaint()
-        self.moved.emit()
+
+        # moving along the projection plane only shifts the image, exactly
+        # so for points at the projection distance
+        if vector.z == 0:
+            dx = -vector.x
+            dy = vector.y * scalar * self.vp.height() / self.win.height()
+            x, y = self.pending_pan or (0, 0)
+            self.pending_pan = (x + dx, y + dy)
+            self.settle_timer.start()
+        else:
+            self.pending_pan = None
 
     def draw_point(self, point, painter=None):
         if painter is None:
             painter = QPainter(self)
-
-        painter.drawPoint(int(point.pos.x), int(point.pos.y))
+        drawing.draw_point(point, painter)
 
     def draw_line(self, line, painter=None):
         if painter is None:
             painter = QPainter(self)
+        drawing.draw_line(line, painter)
 
-        painter.drawLine(
-            int(line.start.x), int(line.start.y), int(line.end.x), int(line.end.y)
-        )
+    def draw_lines(self, starts, ends, painter=None):
+        if painter is None:
+            painter = QPainter(self)
+        drawing.draw_lines(starts, ends, painter)
 
     def draw_polygon(self, polygon, painter=None):
         if painter is None:
             painter = QPainter(self)
-
-        if polygon.style == Polygon.FILLED:
-            poly = QtGui.QPolygonF()
-            for p in polygon.points():
-                poly.append(QtCore.QPointF(p.x, p.y))
-            painter.drawPolygon(poly)
-        else:
-            for line in polygon.lines():
-                self.draw_line(line, painter)
+        drawing.draw_polygon(polygon, painter)
 
     def draw_curve(self, curve, painter=None):
         if painter is None:
             painter = QPainter(self)
-
-        poly = curve.as_polygon()
-        poly.CLIPPING_ALGORITHM = curve.CLIPPING_ALGORITHM
-        self.draw_polygon(poly, painter)
+        drawing.draw_curve(curve, painter)
 
     def draw_3d(self, shape, painter=None):
         if painter is None:
             painter = QPainter(self)
-
-        lines = shape.as_lines()
-        for line in lines:
-            self.draw_line(line, painter)
+        drawing.draw_3d(shape, painter)
 
     def draw_shape(self, shape, painter=None):
         if painter is None:
             painter = QPainter(self)
-
-        if isinstance(shape, Point):
-            self.draw_point(shape, painter)
-
-        elif isinstance(shape, Line):
-            self.draw_line(shape, painter)
-
-        elif isinstance(shape, Polygon):
-            self.draw_polygon(shape, painter)
-
-        elif isinstance(shape, Bezier | BSpline):
-            self.draw_curve(shape, painter)
-
-        elif isinstance(shape, Object3D):
-            self.draw_3d(shape, painter)
-
-        elif isinstance(shape, BicubicBezier):
-            self.draw_3d(shape.as_object_3d(), painter)
-
-        else:
-            raise ValueError(f"The object {shape} is not supported.")
+        drawing.draw_shape(shape, painter)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -164,25 +248,200 @@ class Viewport(QWidget):
     def paintEvent(self, event):
         super().paintEvent(event)
 
+        if self.apply_camera_changes():
+            self.moved.emit()
+
+        size = self.size()
+        stale = self.backing is None or self.backing.size() != size
+        if stale or self.software != (self.pixels is not None):
+            self.backing, self.pixels = self.new_backing(size)
+            self.pending_pan = None
+            self.refined = None
+
+        if self.pending_pan is not None:
+            self.scroll_scene(*self.pending_pan)
+        elif self.ready_frame is not None:
+            self.draw_frame(self.backing, self.ready_frame.shapes)
+            self.pan_remainder = (0, 0)
+
+            # the last pass completes the frame of this camera and scene
+            key = self.refinement_key()
+            if self.refinement == (key, len(constants.REFINE_DETAILS)):
+                self.refinement = None
+                self.refined = key
+        elif self.progressive:
+            # a repaint of the same frame shows the backing store as it is,
+            # with its passes so far
+            key = self.refinement_key()
+            started = self.refinement is not None and self.refinement[0] == key
+            if key != self.refined and not started:
+                self.draw_boxes(self.backing)
+                self.pan_remainder = (0, 0)
+                self.refinement = (key, 0)
+                self.refine_timer.start()
+        elif self.threaded and self.isVisible():
+            self.renderer.submit(self.win, self.vp)
+        else:
+            self.render_scene(self.backing)
+            self.pan_remainder = (0, 0)
+        self.pending_pan = None
+        self.ready_frame = None
+
+        painter = QPainter(self)
+        painter.drawImage(0, 0, self.backing)
+        drawing.draw_shapes(self.scene.get_gliphs(self.vp), painter)
+
+    def frame_ready(self, frame):
+        if frame.window_version != self.win.version:
+            return
+        self.ready_frame = frame
+        self.update()
+        if self.refinement is not None:
+            self.refine_timer.start()
+
+    def refine(self):
+        """
+        Runs the next pass of a progressive frame, drawing meshes at the
+        level of detail of that pass, unless the camera or the scene
+        changed since.
+        """
+        if self.refinement is None:
+            return
+
+        key, step = self.refinement
+        if key != self.refinement_key():
+            self.refinement = None
+            return
+        if step == len(constants.REFINE_DETAILS):
+            return
+
+        detail = constants.REFINE_DETAILS[step]
+        self.refinement = (key, step + 1)
+
+        if self.threaded and self.isVisible():
+            self.renderer.submit(self.win, self.vp, detail)
+        else:
+            shapes = self.scene.projected_shapes(self.win, self.vp, detail=detail)
+            self.frame_ready(FrameResult(self.win.version, tuple(shapes)))
+
+    def refinement_key(self):
+        """
+        The state a progressive frame is drawn for, which must not change
+        while it is refined.
+        """
+        size = self.size()
+        return (self.win.version, self.scene.version, (size.width(), size.height()))
+
+    def new_backing(self, size):
+        """
+        Returns a new backing store image filled with the background, as
+        it may be shown before a frame is drawn into it, together with the
+        array holding its pixels when drawn by the software rasterizer.
+        """
+        if not self.software:
+            image, pixels = QImage(size, QImage.Format_ARGB32_Premultiplied), None
+        else:
+            pixels = np.zeros((size.height(), size.width(), 3), dtype=np.uint8)
+            image = raster.array_image(pixels)
+
+        image.fill(self.palette().color(self.backgroundRole()))
+        return image, pixels
+
+    def render_scene(self, image, clip=None):
+        """
+        Draws the scene into `image`, or only the part of it inside the
+        `clip` region of the viewport.
+        """
+        shapes = self.scene.projected_shapes(self.win, self.vp, clip)
+        self.draw_frame(image, shapes, clip)
+
+    def draw_frame(self, image, shapes, clip=None):
+        # filling some formats takes a painter of its own
+        background = self.palette().color(self.backgroundRole())
+        if clip is None:
+            image.fill(background)
+
+        painter = QPainter(image)
+        try:
+            if clip is not None:
+                rect = self.screen_rect(clip)
+                painter.fillRect(rect, background)
+                painter.setClipRect(rect)
+
+            if image.format() != QImage.Format_RGB888:
+                drawing.draw_shapes(shapes, painter)
+                return
+        finally:
+            # the image is only complete once its painter has ended
+            painter.end()
+
+        bounds = None
+        if clip is not None:
+            bounds = (rect.left(), rect.top(), rect.right() + 1, rect.bottom() + 1)
+        raster.rasterize_shapes(raster.image_array(image), shapes, rect=bounds)
+
+    def draw_boxes(self, image):
+        """
+        Draws the bounding boxes of the visible shapes into `image`, at a
+        cost independent of their size.
+        """
+        image.fill(self.palette().color(self.backgroundRole()))
+        painter = QPainter(image)
+
         pen = QPen()
         pen.setWidth(2)
         pen.setCapStyle(Qt.RoundCap)
 
-        brush = QBrush()
-        brush.setStyle(1)
-
-        painter = QPainter(self)
-
-        for shape in self.scene.projected_shapes(self.win, self.vp):
-            pen.setColor(QColor(*shape.color))
-            brush.setColor(QColor(*shape.color))
-            painter.setPen(pen)
-            painter.setBrush(brush)
-            self.draw_shape(shape, painter)
-
-        for shape in self.scene.get_gliphs(self.vp):
-            pen.setColor(QColor(*shape.color))
-            brush.setColor(QColor(*shape.color))
-            painter.setPen(pen)
-            painter.setBrush(brush)
-            self.draw_shape(shape, painter)
+        try:
+            for color, starts, ends in self.scene.bounding_boxes(self.win, self.vp):
+                pen.setColor(QColor(*color))
+                painter.setPen(pen)
+                self.draw_lines(starts, ends, painter)
+        finally:
+            painter.end()
+
+    def scroll_scene(self, dx, dy):
+        """
+        Shifts the backing store by (dx, dy) pixels and draws only the
+        strips of the viewport left uncovered. The fraction of a pixel not
+        shifted is carried over to the next scroll.
+        """
+
+        rx, ry = self.pan_remainder
+        dx, dy = dx + rx, dy + ry
+        self.pan_remainder = (dx - round(dx), dy - round(dy))
+        dx, dy = round(dx), round(dy)
+
+        vp = self.screen_rect(self.vp)
+        if abs(dx) >= vp.width() or abs(dy) >= vp.height():
+            self.render_scene(self.backing)
+            self.pan_remainder = (0, 0)
+            return
+
+        shifted, pixels = self.new_backing(self.backing.size())
+        painter = QPainter(shifted)
+        painter.setClipRect(vp)
+        painter.drawImage(dx, dy, self.backing)
+        painter.end()
+        self.backing, self.pixels = shifted, pixels
+
+        # one pixel more on each strip covers the width of the pen
+        x0, y0, x1, y1 = vp.left(), vp.top(), vp.right() + 1, vp.bottom() + 1
+        if dx > 0:
+            self.render_scene(self.backing, self.screen_view(x0, y0, x0 + dx + 1, y1))
+        elif dx < 0:
+            self.render_scene(self.backing, self.screen_view(x1 + dx - 1, y0, x1, y1))
+        if dy > 0:
+            self.render_scene(self.backing, self.screen_view(x0, y0, x1, y0 + dy + 1))
+        elif dy < 0:
+            self.render_scene(self.backing, self.screen_view(x0, y1 + dy - 1, x1, y1))
+
+    def screen_view(self, x0, y0, x1, y1):
+        return View(Vector(x0, y1), Vector(x1, y1), Vector(x1, y0), Vector(x0, y0))
+
+    def screen_rect(self, view):
+        lower = view.min()
+        upper = view.max()
+        return QRect(
+            int(lower.x), int(lower.y), int(upper.x - lower.x), int(upper.y - lower.y)
+        )
@@ -0,0 +1,62 @@
+import numpy as np
+
+from surrender.clipping import clip_polyline_depth, clip_polygon_depth
+from surrender.shapes import Bezier, Object3D, Polygon
+from surrender.vector import Vector
+
+NEAR = 1
+FAR = 1000
+
+
+def test_polyline_leaving_and_coming_back_is_split():
+    points = np.array([[0, 0, 10], [10, 0, -10], [20, 0, 10]], dtype=float)
+    runs = clip_polyline_depth(points, NEAR, FAR)
+
+    assert len(runs) == 2
+    assert np.allclose(runs[0], [[0, 0, 10], [4.5, 0, 1]])
+    assert np.allclose(runs[1], [[15.5, 0, 1], [20, 0, 10]])
+
+
+def test_polyline_inside_is_kept_whole():
+    points = np.array([[0, 0, 10], [10, 0, 20], [20, 0, 30]], dtype=float)
+    runs = clip_polyline_depth(points, NEAR, FAR)
+
+    assert len(runs) == 1
+    assert np.array_equal(runs[0], points)
+
+
+def test_closed_polygon_stays_one_ring():
+    points = np.array([[0, 0, 10], [10, 0, -10], [20, 0, 10]], dtype=float)
+    ring = clip_polygon_depth(points, NEAR, FAR)
+
+    assert len(ring) == 4
+    assert np.all(ring[:, 2] >= NEAR)
+
+
+def test_curve_dipping_behind_the_camera_draws_no_segment_across_the_gap():
+    control = [Vector(0, 0, 10), Vector(10, 0, -40), Vector(20, 0, -40)]
+    control.append(Vector(30, 0, 10))
+    curve = Bezier("curve", control)
+    curve.set_resolution(20)
+
+    clipped = curve.clipped_depth(NEAR, FAR)
+
+    assert isinstance(clipped, Object3D)
+    positions = clipped.positions()
+    assert np.all(positions[:, 2] >= NEAR - 1e-9)
+
+    # no edge joins the point where the curve leaves the range to the one
+    # where it comes back
+    starts = positions[clipped.edges[:, 0]]
+    ends = positions[clipped.edges[:, 1]]
+    assert np.all(np.abs(ends[:, 0] - starts[:, 0]) < 5)
+
+
+def test_open_polygon_inside_stays_a_polygon():
+    points = [Vector(0, 0, 10), Vector(10, 0, 20), Vector(20, 0, 30)]
+    polygon = Polygon("path", points, style=Polygon.OPEN)
+
+    clipped = polygon.clipped_depth(NEAR, FAR)
+
+    assert isinstance(clipped, Polygon)
+    assert len(clipped.points()) == 3
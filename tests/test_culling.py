@@ -0,0 +1,43 @@
+import numpy as np
+
+from surrender.culling import classify_shapes
+from surrender.shapes import Line, Polygon
+from surrender.vector import Vector
+from surrender.view import View
+
+
+def screen(width, height):
+    return View(
+        Vector(0, height),
+        Vector(width, height),
+        Vector(width, 0),
+        Vector(0, 0),
+    )
+
+
+def square(x, z):
+    points = [Vector(x, 0, z), Vector(x + 10, 0, z), Vector(x + 10, 10, z)]
+    return Polygon("square", points + [Vector(x, 10, z)])
+
+
+def test_shapes_drawn_without_clipping_are_only_culled_by_depth(monkeypatch):
+    window = screen(800, 600)
+    shapes = [square(100, 0), square(5000, 0), square(100, -5000)]
+
+    visible, _, _ = classify_shapes(shapes, window, screen(800, 600))
+    assert visible.tolist() == [True, False, False]
+
+    monkeypatch.setattr(Polygon, "CLIPPING_ALGORITHM", Polygon.DO_NOT_CLIP)
+    visible, _, _ = classify_shapes(shapes, window, screen(800, 600))
+    assert visible.tolist() == [True, True, False]
+
+
+def test_spheres_enclose_rotated_then_scaled_shapes():
+    line = Line("line", Vector(-100, -100, 0), Vector(100, 100, 0))
+    line.rotate(Vector(0, 0, np.pi / 4))
+    line.scale(Vector(1, 10, 1))
+
+    center, radius = line.bounding_sphere()
+    matrix = line.model_matrix
+    vertices = line.positions() @ matrix[:3, :3] + matrix[3, :3]
+    assert np.all(np.linalg.norm(vertices - center, axis=1) <= radius + 1e-9)
@@ -0,0 +1,99 @@
+import numpy as np
+
+from surrender.culling import classify_bounds
+from surrender.meshlets import Meshlets, morton_order
+from surrender.scene import Scene
+from surrender.shapes import Object3D
+from surrender.vector import Vector
+from surrender.view import View
+
+
+def screen(width, height):
+    return View(
+        Vector(0, height),
+        Vector(width, height),
+        Vector(width, 0),
+        Vector(0, 0),
+    )
+
+
+def grid(n, x0, y0, step):
+    """
+    A flat n by n mesh of squares, with its edges listed row by row.
+    """
+    xs, ys = np.meshgrid(np.arange(n), np.arange(n), indexing="ij")
+    vertices = np.column_stack(
+        (x0 + xs.ravel() * step, y0 + ys.ravel() * step, np.zeros(n * n))
+    )
+    index = np.arange(n * n).reshape(n, n)
+    edges = np.concatenate(
+        (
+            np.column_stack((index[:-1].ravel(), index[1:].ravel())),
+            np.column_stack((index[:, :-1].ravel(), index[:, 1:].ravel())),
+        )
+    )
+    return vertices, edges
+
+
+def drawn_segments(frame):
+    segments = set()
+    for shape in frame:
+        positions = np.round(shape.positions(), 6)
+        for a, b in shape.edges:
+            segments.add(tuple(sorted((tuple(positions[a]), tuple(positions[b])))))
+    return segments
+
+
+def test_morton_order_keeps_nearby_points_together():
+    rng = np.random.default_rng(0)
+    corners = np.array([[0, 0, 0], [100, 0, 0], [0, 100, 0], [100, 100, 0]])
+    points = np.repeat(corners, 8, axis=0) + rng.random((32, 3)) * [10, 10, 0]
+    shuffled = rng.permutation(32)
+
+    order = morton_order(points[shuffled])
+
+    assert sorted(order) == list(range(32))
+    clusters = shuffled[order] // 8
+    assert all(np.all(run == run[0]) for run in np.split(clusters, 4))
+
+
+def test_meshlet_bounds_enclose_their_edges():
+    vertices, edges = grid(20, 0, 0, 10)
+    meshlets = Meshlets(vertices, edges, size=64)
+
+    assert meshlets.counts.sum() == len(edges)
+    assert np.all(meshlets.counts <= 64)
+    for k in range(len(meshlets)):
+        visible = np.arange(len(meshlets)) == k
+        points = vertices[edges[meshlets.edge_mask(visible)]].reshape(-1, 3)
+
+        assert len(points) == 2 * meshlets.counts[k]
+        assert np.all(points >= meshlets.lower[k])
+        assert np.all(points <= meshlets.upper[k])
+        distances = np.linalg.norm(points - meshlets.centers[k], axis=1)
+        assert np.all(distances <= meshlets.radii[k] + 1e-9)
+
+
+def test_culled_meshlets_cover_every_visible_edge(monkeypatch):
+    window = screen(800, 600)
+    vertices, edges = grid(50, -400, 50, 10)
+    # edges listed in no spatial order, unlike the meshlets
+    edges = np.random.default_rng(0).permutation(edges)
+    mesh = Object3D.from_arrays("grid", vertices, edges)
+    scene = Scene()
+    scene.add_shape(mesh)
+
+    # the mesh straddles the left edge of the window, so only some of its
+    # meshlets are culled
+    meshlets = mesh.meshlets()
+    bounds = meshlets.world_bounds(mesh.model_matrix)
+    visible, _, _ = classify_bounds(*bounds, window, screen(800, 600))
+    assert visible.any() and not visible.all()
+
+    culled = drawn_segments(scene.projected_shapes(window, screen(800, 600)))
+    monkeypatch.setattr(Object3D, "meshlets", lambda self: None)
+    scene.cache = {}
+    whole = drawn_segments(scene.projected_shapes(window, screen(800, 600)))
+
+    assert culled
+    assert culled == whole
@@ -0,0 +1,70 @@
+from surrender.picking import PickingIndex
+from surrender.shapes import Bezier, Line, Point
+from surrender.vector import Vector
+from surrender.view import View
+
+
+def line(name, x0, y0, x1, y1):
+    return Line(name, Vector(x0, y0), Vector(x1, y1))
+
+
+def index_of(*shapes):
+    index = PickingIndex()
+    index.update([(shape, shape) for shape in shapes])
+    return index
+
+
+def test_nearest_hits_the_shape_under_the_point():
+    horizontal = line("horizontal", 0, 100, 200, 100)
+    point = Point("point", Vector(300, 300))
+    index = index_of(horizontal, point)
+
+    assert index.nearest(50, 102) is horizontal
+    assert index.nearest(301, 299) is point
+
+
+def test_nearest_misses_far_from_every_shape():
+    index = index_of(line("horizontal", 0, 100, 200, 100))
+
+    assert index.nearest(50, 150) is None
+    assert index.nearest(500, 100) is None
+    assert PickingIndex().nearest(0, 0) is None
+
+
+def test_tolerance_bounds_the_distance():
+    horizontal = line("horizontal", 0, 100, 200, 100)
+    index = index_of(horizontal)
+
+    assert index.nearest(50, 108) is None
+    assert index.nearest(50, 108, tolerance=10) is horizontal
+
+
+def test_overlapping_shapes_pick_the_closest_segment():
+    low = line("low", 0, 100, 200, 100)
+    high = line("high", 0, 104, 200, 104)
+    index = index_of(low, high)
+
+    assert index.nearest(50, 101) is low
+    assert index.nearest(50, 103) is high
+
+
+def test_index_follows_the_frame():
+    horizontal = line("horizontal", 0, 100, 200, 100)
+    vertical = line("vertical", 100, 0, 100, 200)
+    index = index_of(horizontal)
+
+    index.update([(vertical, vertical)])
+    assert index.nearest(50, 100) is None
+    assert index.nearest(100, 50) is vertical
+
+
+def test_curves_are_picked_on_the_polyline_drawn():
+    points = [Vector(0, 0), Vector(100, 0), Vector(200, 0), Vector(300, 0)]
+    curve = Bezier("curve", points)
+    window = View(Vector(0, 50), Vector(150, 50), Vector(150, -50), Vector(0, -50))
+    drawn = curve.clipped(window)
+    index = PickingIndex()
+    index.update([(curve, drawn)])
+
+    assert index.nearest(100, 0) is curve
+    assert index.nearest(250, 0) is None
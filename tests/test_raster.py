@@ -0,0 +1,94 @@
+import numpy as np
+
+from surrender.raster import fill_polygon, rasterize_segments, rasterize_shapes
+from surrender.shapes import Line, Point, Polygon
+from surrender.vector import Vector
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+def blank(width=20, height=12):
+    return np.zeros((height, width, 3), dtype=np.uint8)
+
+
+def pixels(buffer, color=RED):
+    ys, xs = np.nonzero(np.all(buffer == color, axis=2))
+    return set(zip(xs.tolist(), ys.tolist()))
+
+
+def segment(buffer, start, end, width=1, rect=None):
+    rasterize_segments(buffer, [start], [end], [RED], width, rect)
+
+
+def test_horizontal_segment():
+    buffer = blank()
+    segment(buffer, (2, 5), (8, 5))
+
+    assert pixels(buffer) == {(x, 5) for x in range(2, 9)}
+
+
+def test_steep_segment_takes_one_pixel_per_row():
+    buffer = blank()
+    segment(buffer, (3, 1), (5, 9))
+
+    steps = [(3, 1), (3, 2), (4, 3), (4, 4), (4, 5), (4, 6), (4, 7), (5, 8)]
+    assert pixels(buffer) == set(steps) | {(5, 9)}
+
+
+def test_thick_segments_are_stamped_across_their_minor_axis():
+    buffer = blank()
+    segment(buffer, (2, 5), (8, 5), width=2)
+    assert pixels(buffer) == {(x, y) for x in range(2, 9) for y in (4, 5)}
+
+    buffer = blank()
+    segment(buffer, (10, 1), (10, 9), width=2)
+    assert pixels(buffer) == {(x, y) for x in (9, 10) for y in range(1, 10)}
+
+
+def test_segments_are_clipped_to_the_buffer_and_the_rect():
+    buffer = blank()
+    segment(buffer, (-30, 5), (50, 5))
+    assert pixels(buffer) == {(x, 5) for x in range(20)}
+
+    buffer = blank()
+    segment(buffer, (-30, 5), (50, 5), rect=(5, 0, 15, 12))
+    assert pixels(buffer) == {(x, 5) for x in range(5, 15)}
+
+    buffer = blank()
+    segment(buffer, (-30, -5), (-10, 50))
+    assert pixels(buffer) == set()
+
+
+def test_fill_polygon_covers_the_pixel_centers_inside():
+    buffer = blank()
+    fill_polygon(buffer, [(2, 2), (6, 2), (6, 6), (2, 6)], RED)
+    assert pixels(buffer) == {(x, y) for x in range(2, 6) for y in range(2, 6)}
+
+    # a triangle only takes the pixels whose centers it covers
+    buffer = blank()
+    fill_polygon(buffer, [(0, 0), (4, 0), (0, 4)], RED)
+    assert pixels(buffer) == {(x, y) for x in range(4) for y in range(4) if x + y < 3}
+
+
+def test_fill_polygon_is_cut_to_the_rect():
+    buffer = blank()
+    fill_polygon(buffer, [(2, 2), (6, 2), (6, 6), (2, 6)], RED, rect=(4, 0, 20, 3))
+    assert pixels(buffer) == {(4, 2), (5, 2)}
+
+
+def test_rasterize_shapes_draws_outlines_over_fills():
+    square = [Vector(2, 2), Vector(8, 2), Vector(8, 8), Vector(2, 8)]
+    shapes = [
+        Polygon("square", square, BLUE, style=Polygon.FILLED),
+        Line("line", Vector(12, 1), Vector(18, 1), RED),
+        Point("point", Vector(15, 9), RED),
+    ]
+    buffer = blank()
+    rasterize_shapes(buffer, shapes, width=1)
+
+    outline = {(x, y) for x in range(2, 9) for y in (2, 8)}
+    outline |= {(x, y) for x in (2, 8) for y in range(2, 9)}
+    fill = {(x, y) for x in range(3, 8) for y in range(3, 8)}
+    assert pixels(buffer, BLUE) == outline | fill
+    assert pixels(buffer, RED) == {(x, 1) for x in range(12, 19)} | {(15, 9)}
@@ -0,0 +1,30 @@
+from surrender.scene import Scene
+from surrender.shapes import Line, Polygon
+from surrender.vector import Vector
+from surrender.view import View
+
+
+def screen(width, height):
+    return View(
+        Vector(0, height),
+        Vector(width, height),
+        Vector(width, 0),
+        Vector(0, 0),
+    )
+
+
+def square(name, x):
+    points = [Vector(x, 100), Vector(x + 10, 100), Vector(x + 10, 110)]
+    return Polygon(name, points + [Vector(x, 110)])
+
+
+def test_lines_clipped_in_a_batch_keep_their_drawing_order(monkeypatch):
+    monkeypatch.setattr(Line, "CLIPPING_ALGORITHM", Line.LIANG_BARSKY)
+    scene = Scene()
+    scene.add_shape(square("first", 100))
+    scene.add_shape(Line("across", Vector(-5000, 200), Vector(5000, 200)))
+    scene.add_shape(Line("outside", Vector(-50, -50), Vector(-40, -60)))
+    scene.add_shape(square("last", 300))
+
+    frame = scene.projected_shapes(screen(800, 600), screen(800, 600))
+    assert [shape.name for shape in frame] == ["first", "across", "last"]
@@ -0,0 +1,59 @@
+import numpy as np
+
+from surrender.shapes import Object3D
+from surrender.simplify import cluster_vertices
+
+
+def random_mesh(vertices, edges, seed=0):
+    rng = np.random.default_rng(seed)
+    points = rng.random((vertices, 3)) * 100
+    pairs = rng.integers(0, vertices, (edges, 2))
+    return points, pairs[pairs[:, 0] != pairs[:, 1]]
+
+
+def bumpy_grid(n, seed=0):
+    """
+    An n by n mesh of squares over a noisy height field.
+    """
+    rng = np.random.default_rng(seed)
+    xs, ys = np.meshgrid(np.arange(n), np.arange(n), indexing="ij")
+    heights = rng.random(n * n)
+    vertices = np.column_stack((xs.ravel(), ys.ravel(), heights)) * 10
+    index = np.arange(n * n).reshape(n, n)
+    edges = np.concatenate(
+        (
+            np.column_stack((index[:-1].ravel(), index[1:].ravel())),
+            np.column_stack((index[:, :-1].ravel(), index[:, 1:].ravel())),
+        )
+    )
+    return vertices, edges
+
+
+def assert_valid_level(vertices, edges, parent_vertices):
+    assert len(vertices) <= len(parent_vertices)
+    assert edges.min() >= 0
+    assert edges.max() < len(vertices)
+    assert not np.any(edges[:, 0] == edges[:, 1])
+
+
+def test_clusters_are_valid_at_every_resolution():
+    vertices, edges = random_mesh(2000, 6000)
+
+    for resolution in (1, 2, 4, 8, 16, 64):
+        merged, merged_edges = cluster_vertices(vertices, edges, resolution)
+        if len(merged_edges):
+            assert_valid_level(merged, merged_edges, vertices)
+
+
+def test_levels_of_detail_never_grow_past_their_parent():
+    vertices, edges = bumpy_grid(100)
+    mesh = Object3D.from_arrays("mesh", vertices, edges)
+
+    levels = [level for _, level in mesh.lods()]
+    assert levels
+
+    parent = mesh
+    for level in reversed(levels):
+        assert_valid_level(level.positions(), level.edges, parent.positions())
+        assert len(level.edges) <= len(parent.edges)
+        parent = level
@@ -0,0 +1,15 @@
+import numpy as np
+
+from surrender.utils import unique_edges
+
+
+def test_edge_shared_by_two_faces_is_kept_once():
+    # the faces (0, 1, 2) and (2, 1, 3) both hold the edge between 1 and
+    # 2, walked in opposite directions
+    edges = np.array([[0, 1], [1, 2], [2, 0], [2, 1], [1, 3], [3, 2]])
+
+    unique, inverse = unique_edges(edges)
+
+    assert unique.tolist() == [[0, 1], [0, 2], [1, 2], [1, 3], [2, 3]]
+    assert inverse[1] == inverse[3]
+    assert np.array_equal(unique[inverse], np.sort(edges, axis=1))
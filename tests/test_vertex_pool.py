@@ -0,0 +1,38 @@
+import numpy as np
+
+from surrender.shapes import Line
+from surrender.vector import Vector
+from surrender.vertex_pool import VertexPool
+
+
+def line(name, x):
+    return Line(name, Vector(x, 0, 0), Vector(x, 10, 0))
+
+
+def test_shapes_keep_their_positions_after_a_removal_and_a_regrow():
+    pool = VertexPool(capacity=6)
+    first, middle, last = line("first", 1), line("middle", 2), line("last", 3)
+    for shape in (first, middle, last):
+        pool.add(shape)
+
+    pool.remove(middle)
+    # the rows left by the middle shape are not enough for these, so the
+    # pool grows into a new buffer
+    extra = [line(f"extra {i}", 10 + i) for i in range(4)]
+    for shape in extra:
+        pool.add(shape)
+    assert len(pool.data) > 6
+
+    xs = {first: 1, last: 3}
+    xs.update((shape, 10 + i) for i, shape in enumerate(extra))
+    for shape, x in xs.items():
+        expected = [[x, 0, 0], [x, 10, 0]]
+        assert np.array_equal(shape.positions(), expected)
+        assert np.array_equal(pool.positions()[pool.slice_of(shape)], expected)
+
+    # the removed shape keeps its own copy of its points
+    assert np.array_equal(middle.positions(), [[2, 0, 0], [2, 10, 0]])
+
+    # the shapes left still write through to the pool
+    last.set_positions([[8, 0, 0], [8, 10, 0]])
+    assert np.array_equal(pool.positions()[pool.slice_of(last)][:, 0], [8, 8])